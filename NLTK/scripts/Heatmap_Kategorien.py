@@ -1,47 +1,6 @@
-import pandas as pd
-import plotly.graph_objects as go
+import sys
 
-# 📌 Excel laden
-pathes = [
-    "Kategorisierungen_A", "Kategorisierungen_Adv", "Kategorisierungen_Alle",
-    "Kategorisierungen_N", "Kategorisierungen_Verb",
-    "Kategorisierungen_NOUNVERB", "Kategorisierungen_ADJADV"
-]
+from textanalyse.cli import main
 
-for ordner in pathes:
-    df = pd.read_excel(f"{ordner}/kategorie_vergleich.xlsx")
-    
-    # 🔹 Kombiniere Modell & Texttyp
-    df["Kombi"] = df["Model"] + " – " + df["TextType"]
-    df = df.set_index("Kombi")
-
-    # 🔹 Entferne unnötige Spalten
-    df = df.drop(columns=["Model", "TextType"])
-    df = df[sorted(df.columns)]  # 🔁 Alphabetical sorting of categories
-
-    # 🔹 Sicherstellen, dass alle Werte numerisch sind
-    df = df.fillna(0).astype(float)
-
-    # 🔹 Textwerte (für Annotation) vorbereiten
-    text = df.astype(int).astype(str).values.tolist()
-
-    # 📊 Interaktive Heatmap mit Werten im Feld
-    fig = go.Figure(data=go.Heatmap(
-        z=df.values,
-        x=df.columns,
-        y=df.index,
-        text=text,
-        texttemplate="%{text}",
-        colorscale="YlOrRd",
-        colorbar=dict(title="Frequency")
-    ))
-
-    fig.update_layout(
-        title="Heatmap: Semantic categories per model",
-        xaxis_title="Kategorie",
-        yaxis_title="Modell – Texttyp",
-        xaxis_tickangle=-45,
-        height=700
-    )
-
-    fig.write_html(f"{ordner}/interaktive_heatmap.html")
\ No newline at end of file
+if __name__ == "__main__":
+    main(["heatmap"] + sys.argv[1:])
@@ -0,0 +1,197 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+
+import pandas as pd
+
+from textanalyse.aggregate import TextAggregate
+from textanalyse.commands.analyze import NGRAM_NAMES, analysis_label, document_similarity, ngram_rows
+from textanalyse.commands.cluster import export_excel
+from textanalyse.corpus import CORPUS_PATH, HUMAN_MODEL, HUMAN_TEXT_TYPE
+from textanalyse.countmatrix import CountMatrixBuilder
+from textanalyse.docsimilarity import DocumentLemmaCounts
+from textanalyse.docstore import build_doc_store, doc_store_size, iter_doc_store
+from textanalyse.kategorien import CategoryLookup, build_global_categories
+from textanalyse.lemmafilter import LemmaFilter
+from textanalyse.matrixstore import COUNT_COLUMN, write_count_table, write_sparse_matrix
+from textanalyse.metrics import RunMetrics
+from textanalyse.ngrams import ngram_orders
+from textanalyse.pipeline import add_pipe_arguments, load_nlp
+from textanalyse.stylometry import stylometric_features
+from textanalyse.synthetic import CorpusProfile, write_synthetic_corpus
+from textanalyse.vectorstore import build_vector_store, load_vector_store
+
+BENCHMARK_DIR = "./benchmark"
+DEFAULT_SCALES = [1, 10, 100]
+
+# Wie main.py (Wortarten, n-Gramme) und der Lauf "Alle" von clustering.py
+TO_ANALYZE = ["NOUN", "ADJ", "ADV", "VERB"]
+NGRAM_MAX_N = 4
+CONTENT_POS = ["NOUN", "ADJ", "VERB", "ADV"]
+EXCEL_TOP = 100
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Alle Stufen für ein Korpus mit denselben Funktionen wie main.py und clustering.py;
+# jede Stufe ist ein eigener Durchlauf, damit Zeit und Speicher getrennt gemessen
+# werden. Durchläufe über den Doc-Store enthalten dessen Lesezeit, die als eigene
+# Stufe "doc_store_read" zum Abziehen mitgemessen wird. Zwischenergebnisse werden
+# nicht zwischengespeichert (DocCache), jeder Text wird also neu berechnet.
+def run_benchmark(nlp, corpus_path, store_path, output_dir, args):
+    # Spitzen-Speicher je Stufe über tracemalloc: Python- und NumPy-Objekte, nicht spaCys C-Speicher
+    metrics = RunMetrics(f"benchmark {corpus_path}", trace_memory=not args.no_memory)
+    os.makedirs(output_dir, exist_ok=True)
+
+    with metrics.stage("parsing", "texts") as record:
+        build_doc_store(nlp, corpus_path, store_path, n_process=args.n_process, batch_size=args.batch_size,
+                        incremental=False)
+        record["items"] = doc_store_size(store_path)
+    num_texts = record["items"]
+
+    with metrics.stage("doc_store_read", "tokens") as record:
+        for _, _, _, doc in iter_doc_store(nlp, store_path):
+            record["items"] += len(doc)
+    num_tokens = record["items"]
+
+    with metrics.stage("vector_store", "lemmas") as record:
+        vector_path = os.path.join(output_dir, "vektoren")
+        build_vector_store(nlp, vector_path, store_path)
+        lemma_vectors = load_vector_store(vector_path)
+        record["items"] = len(lemma_vectors)
+
+    # Wie main.py: ein TextAggregate je Text, zusammengeführt je Gruppe, dazu
+    # Stilometrie und Lemma-Häufigkeiten je Text für jede Analyse
+    orders = {n: NGRAM_NAMES.get(n, f"{n}-Gramm") for n in ngram_orders(NGRAM_MAX_N)}
+    keep_token = LemmaFilter()
+    analyses = {analysis_label(wortarten): wortarten for wortarten in [TO_ANALYZE] + TO_ANALYZE}
+    group_aggregates = {}
+    document_features = {label: [] for label in analyses}
+    document_lemmas = {label: DocumentLemmaCounts() for label in analyses}
+    with metrics.stage("text_aggregates", "tokens") as record:
+        for text_id, model, text_type, doc in iter_doc_store(nlp, store_path):
+            text_agg = TextAggregate.from_doc(doc, keep_token, orders)
+            group_aggregates.setdefault((model, text_type), TextAggregate(orders)).merge(text_agg)
+            for label, wortarten in analyses.items():
+                lemma_counts = text_agg.lemma_counts(wortarten)
+                document_features[label].append(stylometric_features(text_agg.stats, lemma_counts))
+                document_lemmas[label].add(text_id, model, text_type, lemma_counts)
+            record["items"] += len(doc)
+
+    # Wie main.py: Textvektoren, Gruppenähnlichkeit, Nachbarn und Paare je Analyse
+    groups = [(HUMAN_MODEL, HUMAN_TEXT_TYPE)] + [group for group in group_aggregates if group[0] != HUMAN_MODEL]
+    with metrics.stage("document_similarity", "texts") as record:
+        for label in analyses:
+            document_similarity(document_lemmas[label], lemma_vectors, groups,
+                                os.path.join(output_dir, f"textanalyse{label}.xlsx"), metrics=metrics)
+            record["items"] += len(document_lemmas[label])
+
+    # Wie clustering.py (Lauf "Alle"): Inhaltslemmata je Text
+    content_filter = LemmaFilter(pos=CONTENT_POS, alpha_only=True, require_vector=True)
+    content_lemmas = []
+    with metrics.stage("content_lemmas", "tokens") as record:
+        for _, model, text_type, doc in iter_doc_store(nlp, store_path):
+            content_lemmas.append((model, text_type, content_filter.lemmas(doc)))
+            record["items"] += len(doc)
+
+    global_lemmas = {lemma for _, _, lemmas in content_lemmas for lemma in lemmas}
+    with metrics.stage("build_global_categories", "lemmas") as record:
+        categories = build_global_categories(global_lemmas, lemma_vectors, counters=metrics.counters)
+        category_lookup = CategoryLookup(categories, lemma_vectors, global_lemmas)
+        record["items"] = len(global_lemmas)
+        record["categories"] = len(categories)
+
+    # Lemma-Zeilen je Text, Kategorien über die Indikatormatrix wie in clustering.py
+    with metrics.stage("assign_lemmas_to_categories", "texts") as record:
+        builder = CountMatrixBuilder(len(lemma_vectors))
+        for model, text_type, lemmas in content_lemmas:
+            builder.add(model, text_type, lemma_vectors.rows(lemmas))
+        lemma_counts = builder.build()
+        category_groups, lemma_group_matrix = lemma_counts.group_sums()
+        group_matrix = (lemma_group_matrix @ category_lookup.mapping_matrix()).tocsr()
+        feature_order = category_lookup.category_order(lemma_counts.feature_order)
+        record["items"] = num_texts
+
+    # Ausgaben: n-Gramme und vollständige Lemma-Matrix (main.py), Kategorie-Matrix
+    # und Top-N-Excel (clustering.py)
+    with metrics.stage("report", "files") as record:
+        ngram_results = []
+        lemma_matrix = []
+        for (model, text_type), group in group_aggregates.items():
+            ngram_results.extend(ngram_rows(group, orders, model, text_type))
+            lemma_matrix.extend((model, text_type, lemma, freq)
+                                for lemma, freq in group.lemma_counts(TO_ANALYZE).items())
+        pd.DataFrame(ngram_results).to_excel(os.path.join(output_dir, "ngramme.xlsx"), index=False)
+        df_lemmas = pd.DataFrame(lemma_matrix, columns=["Model", "TextType", "Lemma", COUNT_COLUMN])
+        write_count_table(df_lemmas, os.path.join(output_dir, "lemmata.arrow"), "Lemma")
+
+        write_sparse_matrix(category_groups, category_lookup.names, group_matrix,
+                            os.path.join(output_dir, "kategorie_matrix.arrow"), "Kategorie", feature_order)
+        export_excel(category_groups, group_matrix, category_lookup.names, feature_order, EXCEL_TOP, output_dir)
+        record["items"] = 4
+
+    return {
+        "texts": num_texts,
+        "tokens": num_tokens,
+        "unique_lemmas": len(lemma_vectors),
+        "categories": len(categories),
+        "counters": dict(metrics.counters),
+        "stages": metrics.stages,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Laufzeit- und Speicher-Benchmark der Analyse-Stufen auf synthetischen Korpora")
+    add_pipe_arguments(parser)
+    parser.add_argument("--scales", type=float, nargs="+", default=DEFAULT_SCALES,
+                        help="Korpusgrößen als Vielfaches des echten Korpus")
+    parser.add_argument("--seed", type=int, default=0, help="Zufallsstartwert für die synthetischen Korpora")
+    parser.add_argument("--output", default=None,
+                        help="Ergebnisdatei (JSON); Standard: benchmark/results_<commit>.json")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Spitzen-Speicher nicht mit tracemalloc messen (schneller)")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    output = args.output or os.path.join(BENCHMARK_DIR, f"results_{commit or 'local'}.json")
+    os.makedirs(BENCHMARK_DIR, exist_ok=True)
+
+    nlp = load_nlp()
+    profile = CorpusProfile(CORPUS_PATH)
+
+    results = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "model": f"{nlp.meta.get('lang')}_{nlp.meta.get('name')}-{nlp.meta.get('version')}",
+        "pipeline": nlp.pipe_names,
+        "n_process": args.n_process,
+        "batch_size": args.batch_size,
+        "runs": [],
+    }
+
+    for scale in args.scales:
+        label = f"{scale:g}x"
+        corpus_path = os.path.join(BENCHMARK_DIR, f"texte_{label}.json")
+        print(f"\n📊 Benchmark {label}: erzeuge {corpus_path} ...")
+        num_topics = write_synthetic_corpus(corpus_path, scale, seed=args.seed, profile=profile)
+
+        run = run_benchmark(nlp, corpus_path, os.path.join(BENCHMARK_DIR, f"texte_{label}.spacy"),
+                            os.path.join(BENCHMARK_DIR, f"output_{label}"), args)
+        results["runs"].append({"scale": scale, "topics": num_topics, **run})
+
+        # Nach jeder Größe schreiben, damit lange Läufe Teilergebnisse behalten
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, ensure_ascii=False)
+
+    print(f"\n✅ Benchmark-Ergebnisse gespeichert in: {output}")
@@ -0,0 +1,2 @@
+# Tests importieren das Paket textanalyse aus diesem Ordner (pytest nimmt den
+# Ordner dieser Datei in sys.path auf, auch wenn vom Repository-Root aus gestartet)
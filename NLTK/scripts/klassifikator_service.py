@@ -0,0 +1,6 @@
+import sys
+
+from textanalyse.cli import main
+
+if __name__ == "__main__":
+    main(["classify"] + sys.argv[1:])
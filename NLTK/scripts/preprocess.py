@@ -0,0 +1,22 @@
+import argparse
+
+from textanalyse.docstore import build_doc_store
+from textanalyse.pipeline import add_pipe_arguments, load_nlp
+from textanalyse.vectorstore import build_vector_store
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Korpus einmal parsen und als Doc-Store und Vektor-Store speichern")
+    add_pipe_arguments(parser)
+    parser.add_argument("--full", action="store_true",
+                        help="Alle Texte neu parsen statt nur neue oder geänderte")
+    args = parser.parse_args()
+
+    # Lade spaCy-Modell (ohne Parser/NER)
+    nlp = load_nlp()
+
+    # Korpus einmal parsen – main.py und clustering.py lesen danach nur noch den Doc-Store
+    build_doc_store(nlp, n_process=args.n_process, batch_size=args.batch_size, incremental=not args.full)
+
+    # Lemma-Vektoren des Korpus-Vokabulars als memory-mapped Store – die Analysen
+    # brauchen danach das Sprachmodell nur noch für neue Texte
+    build_vector_store(nlp)
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from textanalyse.commands.classify import handle_request, serve_stdin
+
+
+class EchoClassifier:
+    def classify(self, texts):
+        return [{"length": len(text)} for text in texts]
+
+
+def test_single_and_batch_requests():
+    classifier = EchoClassifier()
+    assert handle_request(classifier, {"text": "abc", "id": 7}) == {"results": [{"id": 7, "length": 3}]}
+    assert handle_request(classifier, {"texts": ["a", "bb"]}) == {
+        "results": [{"id": 0, "length": 1}, {"id": 1, "length": 2}]
+    }
+    assert handle_request(classifier, {"texts": ["a", "bb"], "ids": ["x", "y"]})["results"][1]["id"] == "y"
+
+
+@pytest.mark.parametrize("request_", [
+    ["kein", "Objekt"],
+    {},
+    {"text": 5},
+    {"texts": "ein String"},
+    {"texts": ["a", 3]},
+    {"texts": ["a", "b"], "ids": ["x"]},
+    {"texts": ["a"], "ids": "x"},
+])
+def test_invalid_requests(request_):
+    with pytest.raises(ValueError):
+        handle_request(EchoClassifier(), request_)
+
+
+def test_stdin_answers_errors_per_line(monkeypatch, capsys):
+    lines = ['{"texts": ["a", "b"], "ids": [1]}\n', '{"text": "abc"}\n']
+    monkeypatch.setattr("sys.stdin", lines)
+    serve_stdin(EchoClassifier())
+    answers = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert "error" in answers[0]
+    assert answers[1] == {"results": [{"id": None, "length": 3}]}
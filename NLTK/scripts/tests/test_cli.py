@@ -0,0 +1,16 @@
+import pytest
+
+from textanalyse.cli import build_parser
+
+
+def test_max_n_accepts_bigrams_and_longer():
+    parser = build_parser("analyze")
+    assert parser.parse_args(["analyze", "--max-n", "2"]).max_n == 2
+    assert parser.parse_args(["analyze"]).max_n == 4
+
+
+@pytest.mark.parametrize("value", ["1", "0", "-3", "zwei"])
+def test_max_n_rejects_orders_below_two(value, capsys):
+    with pytest.raises(SystemExit):
+        build_parser("analyze").parse_args(["analyze", "--max-n", value])
+    assert "--max-n" in capsys.readouterr().err
@@ -0,0 +1,51 @@
+import io
+import json
+
+import pytest
+
+from textanalyse.corpus import _iter_json_array, iter_texts
+
+SAMPLE = [
+    {"authorkey": "a1", "humanText": "Ein  Text\nmit Umbruch", "gpt": {"TextA": "Äpfel \"und\" Birnen", "TextB": ""}},
+    12345,
+    -1.5e3,
+    "Zeichenkette mit , und ] darin",
+    [1, [2, 3], {}],
+    True,
+    None,
+    {"leer": {}, "zahlen": [10, 200, 3000]},
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 64, 1 << 16])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_matches_json_load(chunk_size, indent):
+    text = json.dumps(SAMPLE, indent=indent, ensure_ascii=False)
+    assert list(_iter_json_array(io.StringIO(text), chunk_size)) == json.load(io.StringIO(text))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 1 << 16])
+@pytest.mark.parametrize("text", ["[]", "  [ ]  ", "\n[\n]\n"])
+def test_empty_array(text, chunk_size):
+    assert list(_iter_json_array(io.StringIO(text), chunk_size)) == []
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1 << 16])
+@pytest.mark.parametrize("text", ["{}", "", "[1 2]", "[1,,2]", "[,1]", "[1,", "[1", '[{"a": 1}'])
+def test_malformed_input(text, chunk_size):
+    with pytest.raises(ValueError):
+        list(_iter_json_array(io.StringIO(text), chunk_size))
+
+
+def test_iter_texts(tmp_path):
+    path = tmp_path / "texte.json"
+    path.write_text(json.dumps([
+        {"humanText": "Hallo\nWelt", "gpt": {"TextA": "eins", "TextB": "zwei"}},
+        {"humanText": "", "llama": {"TextA": "drei"}},
+    ]), encoding="utf-8")
+    assert list(iter_texts(str(path))) == [
+        (0, "HumanText", "Original", "Hallo Welt"),
+        (0, "gpt", "TextA", "eins"),
+        (0, "gpt", "TextB", "zwei"),
+        (1, "llama", "TextA", "drei"),
+    ]
@@ -0,0 +1,109 @@
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from textanalyse.embeddings import LemmaVectors
+from textanalyse.kategorien import CategoryLookup, SimilarityGraph, build_global_categories
+
+
+# Leader-Schleife aus dem ursprünglichen clustering.py; token.similarity ist dort
+# der Kosinus der Vektoren, hier das Skalarprodukt der Einheitsvektoren
+def reference_categories(lemmas, lemma_vectors, similarity_threshold=0.7):
+    clusters = defaultdict(list)
+    category_vectors = {}
+
+    for lemma in sorted(lemmas):
+        if lemma not in lemma_vectors:
+            continue
+        token = lemma_vectors.matrix[lemma_vectors.index[lemma]]
+
+        best_match = None
+        best_score = 0.0
+
+        for category in clusters:
+            sim = float(category_vectors[category] @ token)
+            if sim > best_score and sim >= similarity_threshold:
+                best_score = sim
+                best_match = category
+
+        if best_match:
+            clusters[best_match].append(lemma)
+        else:
+            clusters[lemma].append(lemma)
+            category_vectors[lemma] = token
+
+    return clusters
+
+
+# Gruppen ähnlicher Vektoren um zufällige Zentren; die Namen sind gemischt, damit
+# die sortierte Reihenfolge nicht der Erzeugungsreihenfolge entspricht
+@pytest.fixture(scope="module")
+def random_vectors():
+    rng = np.random.default_rng(42)
+    centres = rng.normal(size=(25, 16))
+    vectors = centres[rng.integers(0, len(centres), 600)] + 0.6 * rng.normal(size=(600, 16))
+    names = [f"lemma{i:04d}" for i in rng.permutation(600)]
+    return LemmaVectors(names, vectors)
+
+
+# Komponenten aus {-0.5, 0, 0.5, 1}: alle Skalarprodukte sind exakt, egal in welcher
+# Reihenfolge summiert wird. "c", "e" und "g" liegen gleich nah (0.5) an mehreren
+# Leadern, "h" an "b", "d" und "f", aber nicht am ältesten Leader "a".
+@pytest.fixture(scope="module")
+def tie_vectors():
+    vectors = {
+        "a": [1, 0, 0, 0],
+        "b": [0, 1, 0, 0],
+        "c": [0.5, 0.5, 0.5, 0.5],
+        "d": [0, 0, 1, 0],
+        "e": [0.5, 0.5, 0.5, -0.5],
+        "f": [0, 0, 0, 1],
+        "g": [0.5, -0.5, 0.5, 0.5],
+        "h": [-0.5, 0.5, 0.5, 0.5],
+    }
+    return LemmaVectors(list(vectors), np.array(list(vectors.values()), dtype=np.float32))
+
+
+@pytest.mark.parametrize("threshold", [0.3, 0.5, 0.7, 0.9])
+@pytest.mark.parametrize("block_size", [1, 7, 64, 256, 1000])
+def test_blocked_matches_reference(random_vectors, threshold, block_size):
+    lemmas = random_vectors.lemmas + ["ohne_vektor", "auch_ohne"]
+    expected = reference_categories(lemmas, random_vectors, threshold)
+    result = build_global_categories(lemmas, random_vectors, threshold, block_size=block_size)
+    assert len(expected) > 1
+    assert list(result.items()) == list(expected.items())
+
+
+@pytest.mark.parametrize("threshold", [0.3, 0.5, 0.7, 0.9])
+def test_similarity_graph_matches_reference(random_vectors, threshold):
+    graph = SimilarityGraph(random_vectors.lemmas, random_vectors, min_threshold=0.3)
+    clusters, lookup = graph.categorise(threshold)
+    expected = reference_categories(random_vectors.lemmas, random_vectors, threshold)
+    assert list(clusters.items()) == list(expected.items())
+
+    direct = CategoryLookup(clusters, random_vectors, random_vectors.lemmas)
+    assert lookup.names == direct.names
+    np.testing.assert_array_equal(lookup.table, direct.table)
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 3, 100])
+def test_ties_at_threshold(tie_vectors, block_size):
+    expected = reference_categories(tie_vectors.lemmas, tie_vectors, 0.5)
+    assert dict(expected) == {"a": ["a", "c", "e", "g"], "b": ["b", "h"], "d": ["d"], "f": ["f"]}
+
+    result = build_global_categories(tie_vectors.lemmas, tie_vectors, 0.5, block_size=block_size)
+    assert list(result.items()) == list(expected.items())
+
+    clusters, _ = SimilarityGraph(tie_vectors.lemmas, tie_vectors, min_threshold=0.5).categorise(0.5)
+    assert list(clusters.items()) == list(expected.items())
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 100])
+def test_just_above_ties(tie_vectors, block_size):
+    threshold = float(np.nextafter(np.float32(0.5), np.float32(1)))
+    expected = reference_categories(tie_vectors.lemmas, tie_vectors, threshold)
+    assert list(expected) == tie_vectors.lemmas
+
+    result = build_global_categories(tie_vectors.lemmas, tie_vectors, threshold, block_size=block_size)
+    assert list(result.items()) == list(expected.items())
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from textanalyse.matrixstore import read_count_matrix, read_sparse_matrix, write_count_table, write_sparse_matrix
+
+GROUPS = [("gpt", "Essay"), ("llama", "Essay"), ("gpt", "Mail"), ("mistral", "Mail")]
+FEATURES = ["Haus", "Baum", "Auto"]
+# ("llama", "Essay") hat keine einzige Zählung
+COUNTS = np.array([
+    [3, 0, 1],
+    [0, 0, 0],
+    [0, 2, 0],
+    [1, 1, 5],
+])
+
+
+def test_sparse_round_trip_keeps_all_zero_group(tmp_path):
+    path = tmp_path / "kategorie_matrix.arrow"
+    write_sparse_matrix(GROUPS, FEATURES, sparse.csr_matrix(COUNTS), path, "Kategorie")
+
+    groups, features, matrix = read_sparse_matrix(path)
+    assert groups == GROUPS
+    assert features == FEATURES
+    np.testing.assert_array_equal(matrix.toarray(), COUNTS)
+
+
+def test_wide_round_trip_keeps_all_zero_group(tmp_path):
+    path = tmp_path / "kategorie_matrix.arrow"
+    write_sparse_matrix(GROUPS, FEATURES, sparse.csr_matrix(COUNTS), path, "Kategorie")
+
+    wide = read_count_matrix(path)
+    assert list(wide.columns) == ["Model", "TextType"] + FEATURES
+    assert list(zip(wide["Model"], wide["TextType"])) == GROUPS
+    np.testing.assert_array_equal(wide[FEATURES].to_numpy(), COUNTS)
+
+
+def test_count_table_with_explicit_groups(tmp_path):
+    path = tmp_path / "lemmata.arrow"
+    long_df = pd.DataFrame({
+        "Model": ["gpt", "gpt", "mistral"],
+        "TextType": ["Mail", "Essay", "Mail"],
+        "Lemma": ["Baum", "Haus", "Haus"],
+        "Häufigkeit": [2, 3, 1],
+    })
+    write_count_table(long_df, path, "Lemma", pd.MultiIndex.from_tuples(GROUPS, names=["Model", "TextType"]))
+
+    groups, features, matrix = read_sparse_matrix(path)
+    assert groups == GROUPS
+    assert features == ["Baum", "Haus"]
+    np.testing.assert_array_equal(matrix.toarray(), [[0, 3], [0, 0], [2, 0], [0, 1]])
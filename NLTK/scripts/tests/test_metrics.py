@@ -0,0 +1,34 @@
+import pytest
+
+from textanalyse import metrics
+from textanalyse.metrics import RunMetrics
+
+
+class FakeUsage:
+    ru_maxrss = 512 * 2**20
+
+
+class FakeResource:
+    RUSAGE_SELF = 0
+
+    @staticmethod
+    def getrusage(who):
+        return FakeUsage()
+
+
+@pytest.mark.parametrize("platform, expected", [("linux", 512 * 2**10), ("darwin", 512)])
+def test_max_rss_units(monkeypatch, platform, expected):
+    monkeypatch.setattr(metrics, "resource", FakeResource)
+    monkeypatch.setattr(metrics.sys, "platform", platform)
+    assert metrics.max_rss_mb() == expected
+
+
+def test_without_resource_module(monkeypatch):
+    monkeypatch.setattr(metrics, "resource", None)
+    run = RunMetrics("test")
+    with run.stage("stufe", unit="texts") as record:
+        record["items"] = 3
+    result = run.to_dict()
+    assert "max_rss_mb" not in result
+    assert "max_rss_mb" not in result["stages"][0]
+    assert result["stages"][0]["items"] == 3
@@ -0,0 +1 @@
+# Gemeinsame Bausteine für main.py und clustering.py
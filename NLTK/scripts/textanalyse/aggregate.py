@@ -0,0 +1,72 @@
+from collections import Counter
+
+from .ngrams import NgramCounts
+
+
+# Satz- und Wortstatistik als laufende Summen, direkt aus dem geparsten Doc:
+# Sätze (senter), Tokens ohne Leerraum (Satzzeichen zählen wie bei
+# nltk.word_tokenize mit), Wortlängen und Token-Häufigkeiten in einem Durchlauf.
+# Texte werden einzeln gezählt, Gruppen ergeben sich durch merge() als Summe.
+class TextStats:
+    def __init__(self):
+        self.num_sentences = 0
+        self.num_words = 0
+        self.word_length_sum = 0
+        self.word_counts = Counter()
+
+    @classmethod
+    def from_doc(cls, doc):
+        stats = cls()
+        for token in doc:
+            if token.is_sent_start:
+                stats.num_sentences += 1
+            if token.is_space:
+                continue
+            stats.num_words += 1
+            stats.word_length_sum += len(token.text)
+            stats.word_counts[token.text] += 1
+        return stats
+
+    def merge(self, other):
+        self.num_sentences += other.num_sentences
+        self.num_words += other.num_words
+        self.word_length_sum += other.word_length_sum
+        self.word_counts.update(other.word_counts)
+        return self
+
+
+# Alles, was main.py pro Text braucht, als zusammenführbares Aggregat:
+# Lemma-Häufigkeiten je (Lemma, POS), n-Gramme und Satz-/Wortstatistik,
+# alles aus demselben Doc.
+# Jeder Text wird für sich verarbeitet; die Gruppe (Modell/Texttyp) ergibt
+# sich durch merge() in Korpus-Reihenfolge.
+class TextAggregate:
+    def __init__(self, ngram_orders):
+        self.lemma_pos = Counter()
+        self.ngrams = NgramCounts(ngram_orders)
+        self.stats = TextStats()
+
+    @classmethod
+    def from_doc(cls, doc, keep_token, ngram_orders):
+        agg = cls(ngram_orders)
+        agg.lemma_pos.update((token.lemma_.lower(), token.pos_) for token in doc if keep_token(token))
+        agg.ngrams = NgramCounts.from_tokens([token.text.lower() for token in doc if token.is_alpha], ngram_orders)
+        agg.stats = TextStats.from_doc(doc)
+        return agg
+
+    def merge(self, other):
+        self.lemma_pos.update(other.lemma_pos)
+        self.ngrams.merge(other.ngrams)
+        self.stats.merge(other.stats)
+        return self
+
+    # Lemma-Häufigkeiten für eine Wortart ("NOUN") oder eine Liste von Wortarten,
+    # in der Reihenfolge des ersten Vorkommens
+    def lemma_counts(self, wortarten):
+        if isinstance(wortarten, str):
+            wortarten = [wortarten]
+        counts = Counter()
+        for (lemma, pos), freq in self.lemma_pos.items():
+            if pos in wortarten:
+                counts[lemma] += freq
+        return counts
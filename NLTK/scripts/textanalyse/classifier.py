@@ -0,0 +1,153 @@
+import os
+from collections import Counter
+
+import numpy as np
+from pyarrow import feather
+
+from .aggregate import TextStats
+from .corpus import HUMAN_MODEL, clean_text
+from .kategorien import CODEBOOK_FILE, CategoryCodebook
+from .lemmafilter import LemmaFilter
+from .matrixstore import read_sparse_matrix
+from .pipeline import DEFAULT_BATCH_SIZE, pipe_texts
+from .stylometry import FEATURES, GROUP_COLUMNS, stylometric_features
+
+# Wortarten der Lemma-Merkmale, wie die Gesamtanalyse von main.py
+ANALYSIS_POS = ["NOUN", "ADJ", "ADV", "VERB"]
+
+# Kategorienmatrix von clustering.py im Kategorie-Ordner
+CATEGORY_MATRIX_FILE = "kategorie_matrix.arrow"
+
+# Hinweise ab so vielen Standardabweichungen (über die Korpustexte) vom Korpusmittel
+HINT_Z = 1.0
+
+# Anzahl Kategorien im Profil eines Textes
+PROFILE_TOP = 10
+
+
+# Stilometrische Referenz aus den Merkmalsvektoren der Korpustexte:
+# Mittelwert über alle Texte sowie Mittelwert und Standardabweichung je Modell/Texttyp
+class ReferenceStats:
+    def __init__(self, doc_features):
+        self.global_mean = doc_features[FEATURES].mean()
+        self.global_std = doc_features[FEATURES].std().fillna(0)
+        grouped = doc_features.groupby(GROUP_COLUMNS, sort=False)[FEATURES]
+        group_mean = grouped.mean()
+        group_std = grouped.std().fillna(0)
+        self.groups = list(group_mean.index)
+        self.group_mean = group_mean.to_numpy()
+        self.group_std = np.where(group_std.to_numpy() > 0, group_std.to_numpy(), 1.0)
+
+    @classmethod
+    def from_file(cls, path):
+        return cls(feather.read_table(path, memory_map=True).to_pandas())
+
+    # Abweichung jedes Merkmals vom Korpusmittel (wie klassifikator.py) und die
+    # nächstgelegene Gruppe (kleinster mittlerer quadrierter z-Wert)
+    def deviations(self, features):
+        values = np.array([features[feature] for feature in FEATURES], dtype=np.float64)
+        z = (values - self.group_mean) / self.group_std
+        distance = np.sqrt((z ** 2).mean(axis=1))
+        order = np.argsort(distance, kind="stable")
+
+        return {
+            "features": {
+                feature: {
+                    "value": round(float(value), 4),
+                    "global_mean": round(float(self.global_mean[feature]), 4),
+                    "delta": round(float(value - self.global_mean[feature]), 4),
+                }
+                for feature, value in zip(FEATURES, values)
+            },
+            "nearest_groups": [
+                {"Model": self.groups[i][0], "TextType": self.groups[i][1], "distance": round(float(distance[i]), 4)}
+                for i in order[:3]
+            ],
+        }
+
+    # Bewertungshinweise aus klassifikator.py. Dessen feste Abstände (z. B. 200 Lemmata)
+    # galten für Werte ganzer Gruppen; hier wird ein einzelner Text mit den Korpustexten
+    # verglichen, daher gilt als auffällig, was HINT_Z Standardabweichungen abweicht
+    def hints(self, features):
+        mean, limit = self.global_mean, HINT_Z * self.global_std
+        hints = []
+        if features["TTR_Lemma_based"] < mean["TTR_Lemma_based"] - limit["TTR_Lemma_based"]:
+            hints.append("Niedrige TTR – Hinweis auf maschinellen Stil.")
+        if features["AvgSentenceLength"] > mean["AvgSentenceLength"] + limit["AvgSentenceLength"]:
+            hints.append("Lange Satzstruktur – oft in KI-Texten.")
+        if features["UniqueLemmas"] < mean["UniqueLemmas"] - limit["UniqueLemmas"]:
+            hints.append("Geringe Wortvielfalt – typisch für KI.")
+        if features["TTR_Token_based"] < mean["TTR_Token_based"] - limit["TTR_Token_based"]:
+            hints.append("Auch auf Token-Ebene geringe Vielfalt.")
+        if not hints:
+            hints.append("Stilometrische Merkmale im Rahmen menschlicher Varianz.")
+        return hints
+
+
+# Anteil jeder Kategorie am Korpus: Human-Texte und Mittel über alle Modellgruppen
+def category_reference(matrix_path, names):
+    groups, features, matrix = read_sparse_matrix(matrix_path)
+    columns = {name: i for i, name in enumerate(features)}
+    dense = np.zeros((len(groups), len(names)))
+    for j, name in enumerate(names):
+        if name in columns:
+            dense[:, j] = matrix[:, columns[name]].toarray().ravel()
+    totals = dense.sum(axis=1, keepdims=True)
+    shares = dense / np.where(totals > 0, totals, 1)
+
+    human = np.array([model == HUMAN_MODEL for model, _ in groups])
+    human_share = shares[human].mean(axis=0) if human.any() else np.zeros(len(names))
+    model_share = shares[~human].mean(axis=0) if (~human).any() else np.zeros(len(names))
+    return human_share, model_share
+
+
+# Bewertet neue Texte gegen das Korpus. Modell, Referenzwerte und Kategorien
+# werden einmal geladen; classify() nimmt beliebig große Batches und parst sie
+# gemeinsam mit nlp.pipe.
+class TextClassifier:
+    def __init__(self, nlp, reference, codebook, category_shares=None, batch_size=DEFAULT_BATCH_SIZE):
+        self.nlp = nlp
+        self.reference = reference
+        self.codebook = codebook
+        self.category_shares = category_shares
+        self.batch_size = batch_size
+        self.keep_token = LemmaFilter()
+        self.content_filter = LemmaFilter(pos=codebook.pos, alpha_only=True, require_vector=True)
+
+    @classmethod
+    def load(cls, nlp, reference_path, category_folder, batch_size=DEFAULT_BATCH_SIZE):
+        reference = ReferenceStats.from_file(reference_path)
+        codebook = CategoryCodebook.from_file(nlp, os.path.join(category_folder, CODEBOOK_FILE))
+        matrix_path = os.path.join(category_folder, CATEGORY_MATRIX_FILE)
+        category_shares = category_reference(matrix_path, codebook.names) if os.path.exists(matrix_path) else None
+        return cls(nlp, reference, codebook, category_shares, batch_size)
+
+    def _category_profile(self, doc):
+        counts = self.codebook.count_vector(self.content_filter.lemmas(doc))
+        total = int(counts.sum())
+        top = np.argsort(-counts, kind="stable")[:PROFILE_TOP]
+        profile = []
+        for c in top:
+            if counts[c] == 0:
+                break
+            entry = {"category": self.codebook.names[c], "count": int(counts[c]), "share": round(counts[c] / total, 4)}
+            if self.category_shares is not None:
+                entry["human_share"] = round(float(self.category_shares[0][c]), 4)
+                entry["model_share"] = round(float(self.category_shares[1][c]), 4)
+            profile.append(entry)
+        return {"categorised_lemmas": total, "top_categories": profile}
+
+    def classify_doc(self, doc):
+        lemma_counts = Counter(
+            token.lemma_.lower() for token in doc if self.keep_token(token) and token.pos_ in ANALYSIS_POS
+        )
+        features = stylometric_features(TextStats.from_doc(doc), lemma_counts)
+        return {
+            "stylometry": self.reference.deviations(features),
+            "hints": self.reference.hints(features),
+            "categories": self._category_profile(doc),
+        }
+
+    def classify(self, texts):
+        docs = pipe_texts(self.nlp, (clean_text(text) for text in texts), batch_size=self.batch_size)
+        return [self.classify_doc(doc) for doc in docs]
@@ -0,0 +1,37 @@
+import argparse
+import importlib
+import sys
+
+# Unterbefehl -> (Modul, Kurzbeschreibung). Die Kurzbeschreibungen stehen hier,
+# damit die Übersicht (--help) kein Befehlsmodul laden muss.
+COMMANDS = {
+    "analyze": ("textanalyse.commands.analyze", "Lemma-, n-Gramm- und Stilometrie-Analyse (main.py)"),
+    "cluster": ("textanalyse.commands.cluster", "Semantische Kategorien der Lemmata (clustering.py)"),
+    "deviations": ("textanalyse.commands.deviations", "Über-/Unterrepräsentierte Kategorien (abweichungen_kategorien.py)"),
+    "significance": ("textanalyse.commands.significance", "Signifikanz der Abweichungen (Permutationen, Konfidenzintervalle)"),
+    "heatmap": ("textanalyse.commands.heatmap", "Interaktive Kategorie-Heatmap (Heatmap_Kategorien.py)"),
+    "classify": ("textanalyse.commands.classify", "Bewertung neuer Texte als Dienst (klassifikator_service.py)"),
+}
+
+
+# Nur das Modul des aufgerufenen Unterbefehls wird importiert, und dessen
+# schwere Abhängigkeiten erst in run()
+def build_parser(command=None):
+    parser = argparse.ArgumentParser(prog="python -m textanalyse", description="Textanalyse des Korpus")
+    subparsers = parser.add_subparsers(dest="command", metavar="BEFEHL", required=True)
+    for name, (module_name, help) in COMMANDS.items():
+        if name == command:
+            module = importlib.import_module(module_name)
+            subparser = subparsers.add_parser(name, help=help, description=module.DESCRIPTION)
+            module.add_arguments(subparser)
+            subparser.set_defaults(run=module.run)
+        else:
+            subparsers.add_parser(name, help=help, add_help=False)
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    command = next((arg for arg in argv if not arg.startswith("-")), None)
+    args = build_parser(command if command in COMMANDS else None).parse_args(argv)
+    args.run(args)
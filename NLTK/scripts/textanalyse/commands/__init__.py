@@ -0,0 +1,3 @@
+# Unterbefehle der Kommandozeile (python -m textanalyse): jedes Modul hat
+# DESCRIPTION, add_arguments(parser) und run(args). Beim Import passiert nichts;
+# spaCy, das Sprachmodell, matplotlib und plotly lädt erst run().
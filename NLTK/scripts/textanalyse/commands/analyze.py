@@ -0,0 +1,334 @@
+import argparse
+import os
+
+from ..metrics import add_metrics_arguments
+from ..pipeline import add_pipe_arguments
+
+# Wortarten zur Analyse
+to_analyze = ["NOUN", "ADJ", "ADV", "VERB"]
+
+# Spaltennamen der n-Gramm-Ordnungen
+NGRAM_NAMES = {2: "Bigram", 3: "Trigram", 4: "Quadrigram", 5: "Pentagram"}
+
+# Version der Zwischenergebnisse je Text im Cache – bei Änderungen am Lemma-Filter
+# oder an TextAggregate erhöhen, dann wird alles neu berechnet
+CACHE_VERSION = 3
+
+# Laufzeit-Metriken (Stufen, Zähler, optional Profil) neben den Excel-Dateien
+METRICS_FILE = "textanalyse_metrics.json"
+
+# Text×Lemma-Zählmatrix je Analyse (Endung statt .xlsx), Grundlage der Signifikanztests
+DOCUMENT_MATRIX_SUFFIX = "_lemmata_texte.npz"
+
+DESCRIPTION = "Lemma-, n-Gramm- und Stilometrie-Analyse des Korpus"
+
+
+# Längste n-Gramm-Ordnung: mindestens 2 (Bigramme), sonst gäbe es keine n-Gramme
+def max_ngram_order(value):
+    max_n = int(value)
+    if max_n < 2:
+        raise argparse.ArgumentTypeError(f"muss mindestens 2 sein (Bigramme), nicht {max_n}")
+    return max_n
+
+
+def add_arguments(parser):
+    add_pipe_arguments(parser)
+    add_metrics_arguments(parser)
+    parser.add_argument("--top-lemmas", type=int, default=100,
+                        help="Anzahl der häufigsten Lemmata pro Modell/Texttyp im Excel-Export")
+    parser.add_argument("--max-n", type=max_ngram_order, default=4,
+                        help="Längste n-Gramm-Ordnung (2 = nur Bigramme)")
+    parser.add_argument("--neighbours", type=int, default=10,
+                        help="Anzahl der ähnlichsten Texte je Text (*_nachbarn.arrow)")
+    parser.add_argument("--similarity-matrix", action="store_true",
+                        help="Zusätzlich die vollständige Text×Text-Matrix als *_aehnlichkeit.npy speichern "
+                             "(n² Werte, bei großen Korpora sehr groß)")
+    return parser
+
+
+# Stilometrie-Features aus den Satz-/Wortsummen (spaCy) und den gefilterten Lemma-Häufigkeiten
+def get_stylometric_features(stats, lemma_counts, model, text_type, label_suffix=""):
+    from ..stylometry import stylometric_features
+
+    features = stylometric_features(stats, lemma_counts)
+    num_sentences = features["NumSentences"]
+    num_words = features["NumWords"]
+    avg_sentence_length = features["AvgSentenceLength"]
+    avg_word_length = features["AvgWordLength"]
+    unique_lemmas = features["UniqueLemmas"]
+    num_lemmas = features["Num_Lemmas"]
+    lemma_ttr = features["TTR_Lemma_based"]
+    token_ttr = features["TTR_Token_based"]
+
+    output_dir = "unique_lemmata_output"
+    os.makedirs(output_dir, exist_ok=True)
+
+    filename = f"{model}_{text_type}{label_suffix}_stylometry.txt"
+    file_path = os.path.join(output_dir, filename)
+
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write(f"Model: {model}\n")
+        file.write(f"Texttype: {text_type}\n")
+        file.write(f"Num_Lemmas: {num_lemmas}\n")
+        file.write(f"Unique Lemmas ({unique_lemmas}):\n")
+        file.write(", ".join(sorted(lemma_counts)) + "\n")
+        file.write("\nStylometric Features:\n")
+        file.write(f"NumSentences: {num_sentences}\n")
+        file.write(f"AvgSentenceLength: {round(avg_sentence_length, 2)}\n")
+        file.write(f"TTR_Lemma_based: {round(lemma_ttr, 3)}\n")
+        file.write(f"TTR_Token_Based: {round(token_ttr, 3)}\n")
+        file.write(f"NumWords: {num_words}\n")
+        file.write(f"AvgWordLength: {round(avg_word_length, 2)}\n")
+
+    print(f"✅ Stylometric features gespeichert in: {file_path}")
+
+    return {
+        "NumSentences": num_sentences,
+        "NumWords": num_words,
+        "AvgSentenceLength": round(avg_sentence_length, 2),
+        "Num_Lemmas": {num_lemmas},
+        "UniqueLemmas": unique_lemmas,
+        "TTR_Lemma_based": round(lemma_ttr, 3),
+        "TTR_Token_based": round(token_ttr, 3),
+        "AvgWordLength": round(avg_word_length, 2)
+    }
+
+
+# Analysen: gesamt und je Wortart (Dateisuffix -> Wortarten)
+def analysis_label(wortarten):
+    return "_gesamt" if isinstance(wortarten, list) else f"_{wortarten}"
+
+
+# n-Gramm-Zeilen einer Gruppe
+def ngram_rows(group, ngram_orders, model, text_type, top_k=50):
+    rows = []
+    for n, column in ngram_orders.items():
+        for ngram, freq in group.ngrams.most_common(n, top_k):
+            rows.append({"Model": model, "TextType": text_type, column: " ".join(ngram), "Frequency": freq})
+    return rows
+
+
+# Mittelvektor jedes Textes, normalisiert als eine Matrix: daraus die Ähnlichkeit
+# Human–Modell je Gruppe (groups[0] = Human), die nächsten Nachbarn jedes Textes
+# (blockweise; die volle Text×Text-Matrix nur mit similarity_matrix) und die
+# Verteilungen der Ähnlichkeiten innerhalb der Themen
+def document_similarity(documents, lemma_vectors, groups, output_filename, neighbours=10, similarity_matrix=False,
+                        metrics=None):
+    from ..docsimilarity import (
+        group_similarity,
+        group_vectors,
+        nearest_neighbours,
+        normalise_rows,
+        similarity_distributions,
+        within_topic_pairs,
+        write_pairs,
+        write_similarity_matrix,
+    )
+
+    doc_vectors, weights = documents.document_vectors(lemma_vectors)
+    unit = normalise_rows(doc_vectors)
+
+    # Gruppenvektor = Mittel über alle Lemma-Vorkommen der Gruppe
+    group_unit = normalise_rows(group_vectors(doc_vectors, weights, documents.models, documents.text_types, groups))
+    similarities = dict(zip(groups[1:], group_unit[1:] @ group_unit[0]))
+
+    pairs = nearest_neighbours(unit, documents.text_ids, documents.models, documents.text_types, k=neighbours)
+    neighbours_filename = output_filename.replace(".xlsx", "_nachbarn.arrow")
+    write_pairs(pairs, neighbours_filename)
+    saved = [neighbours_filename]
+
+    if similarity_matrix:
+        similarity_filename = output_filename.replace(".xlsx", "_aehnlichkeit.npy")
+        write_similarity_matrix(unit, similarity_filename)
+        saved.append(similarity_filename)
+
+    pairs = within_topic_pairs(unit, documents.text_ids, documents.models, documents.text_types)
+    pairs_filename = output_filename.replace(".xlsx", "_paare.arrow")
+    write_pairs(pairs, pairs_filename)
+    saved.append(pairs_filename)
+    if metrics is not None:
+        metrics.count("document_pairs", len(documents) ** 2)
+        metrics.count("topic_pairs", len(pairs))
+    print(f"✅ Text×Text-Ähnlichkeiten gespeichert unter: {', '.join(saved)}")
+
+    return similarities, similarity_distributions(pairs), group_similarity(unit, documents.models, documents.text_types)
+
+
+def run(args):
+    import pandas as pd
+
+    from ..aggregate import TextAggregate
+    from ..corpus import HUMAN_MODEL, HUMAN_TEXT_TYPE
+    from ..doccache import DocCache, iter_partials
+    from ..docsimilarity import DocumentLemmaCounts
+    from ..docstore import ensure_doc_store
+    from ..lemmafilter import LemmaFilter
+    from ..matrixstore import COUNT_COLUMN, write_count_table, write_document_matrix
+    from ..metrics import RunMetrics
+    from ..ngrams import ngram_orders
+    from ..pipeline import load_nlp
+    from ..vectorstore import ensure_vector_store, load_vector_store, model_required
+    from ..stylometry import group_distributions, stylometric_features, write_document_features
+
+    # n-Gramm-Ordnungen 2..max_n und ihre Spaltennamen
+    NGRAM_ORDERS = {n: NGRAM_NAMES.get(n, f"{n}-Gramm") for n in ngram_orders(args.max_n)}
+
+    metrics = RunMetrics("main", profile=args.profile, trace_memory=args.trace_memory)
+
+    cache_version = f"{CACHE_VERSION}:{sorted(NGRAM_ORDERS)}"
+
+    # Lade spaCy-Modell (ohne Parser/NER) – nur wenn Doc-Store, Vektor-Store oder
+    # Cache nicht mehr zum Korpus passen
+    with metrics.stage("load_model"):
+        nlp = load_nlp() if model_required([("main", cache_version)]) else None
+    metrics.count("model_loaded", int(nlp is not None))
+
+    # Texte einmal parsen (Doc-Store); nur neue oder geänderte Texte werden neu geparst.
+    # Vektoren des Korpus-Vokabulars einmal in den Vektor-Store exportieren
+    with metrics.stage("doc_store"):
+        if nlp is not None:
+            ensure_doc_store(nlp, n_process=args.n_process, batch_size=args.batch_size)
+            ensure_vector_store(nlp)
+
+    # Wortartunabhängiger Teil des Lemma-Filters (gemeinsam mit clustering.py,
+    # Entscheidung je Lexem und Wortart zwischengespeichert)
+    keep_token = LemmaFilter()
+
+    # Jeder Text wird einzeln verarbeitet und in das Aggregat seiner Gruppe
+    # (Human/Modell/Texttyp) eingerechnet – in Korpus-Reihenfolge, daher ergeben
+    # sich dieselben Zahlen wie für die zusammengefügten Texte.
+    # Lemma-Häufigkeiten je Wortart, n-Gramme und Satz-/Wortstatistik hängen nicht
+    # von der Analyse ab; die Läufe je Wortart lesen nur noch diese Aggregate.
+    # Die Aggregate je Text liegen im Cache; berechnet werden nur neue oder geänderte Texte.
+    human_group = TextAggregate(NGRAM_ORDERS)
+    model_groups = {}
+
+    analyses = {analysis_label(wortarten): wortarten for wortarten in [to_analyze] + to_analyze}
+
+    # Stilometrie-Merkmalsvektor und Lemma-Häufigkeiten jedes einzelnen Textes, je Analyse
+    document_features = {label: [] for label in analyses}
+    document_lemmas = {label: DocumentLemmaCounts() for label in analyses}
+
+    def text_aggregate(doc):
+        return TextAggregate.from_doc(doc, keep_token, NGRAM_ORDERS)
+
+    cache = DocCache("main", cache_version)
+    with metrics.stage("text_aggregates", unit="texts") as stage:
+        for text_id, model_name, text_type, text_agg in iter_partials(nlp, cache, text_aggregate, metrics=metrics):
+            if model_name == HUMAN_MODEL:
+                human_group.merge(text_agg)
+            else:
+                if model_name not in model_groups:
+                    model_groups[model_name] = {"TextA": TextAggregate(NGRAM_ORDERS), "TextB": TextAggregate(NGRAM_ORDERS)}
+                model_groups[model_name][text_type].merge(text_agg)
+            for label, wortarten in analyses.items():
+                lemma_counts = text_agg.lemma_counts(wortarten)
+                document_features[label].append({
+                    "TextID": text_id, "Model": model_name, "TextType": text_type,
+                    **stylometric_features(text_agg.stats, lemma_counts),
+                })
+                document_lemmas[label].add(text_id, model_name, text_type, lemma_counts)
+            stage["items"] += 1
+            metrics.count("texts")
+            metrics.count("alpha_tokens", text_agg.ngrams.length)
+            metrics.count("words", text_agg.stats.num_words)
+    cache.close()
+
+    # Lemma-Vektoren aus dem Vektor-Store (memory-mapped, ohne Sprachmodell)
+    with metrics.stage("lemma_vectors"):
+        corpus_lemmas = {lemma for lemma, _ in human_group.lemma_pos}
+        for texts in model_groups.values():
+            for group in texts.values():
+                corpus_lemmas.update(lemma for lemma, _ in group.lemma_pos)
+        lemma_vectors = load_vector_store()
+    metrics.count("unique_lemmas", len(corpus_lemmas))
+    metrics.count("lemmas_with_vector", sum(1 for lemma in corpus_lemmas if lemma in lemma_vectors))
+
+    # Analyse-Funktion
+    def run_analysis(wortarten, output_filename):
+        print(f"\n🔍 Starte Analyse für: {wortarten if isinstance(wortarten, list) else [wortarten]}")
+        label_suffix = analysis_label(wortarten)
+
+        results = []
+        similarity_results = []
+        ngram_results = []
+        lemma_matrix = []
+
+        with metrics.stage(f"document_similarity{label_suffix}", unit="texts") as stage:
+            groups = [(HUMAN_MODEL, HUMAN_TEXT_TYPE)] + [
+                (model, text_type) for model, texts in model_groups.items() for text_type in texts
+            ]
+            similarities, df_similarity_distribution, df_group_similarity = document_similarity(
+                document_lemmas[label_suffix], lemma_vectors, groups, output_filename, args.neighbours,
+                args.similarity_matrix, metrics)
+            stage["items"] = len(document_lemmas[label_suffix])
+
+        # Human-Text analysieren
+        human_lemmas = human_group.lemma_counts(wortarten)
+        human_features = get_stylometric_features(human_group.stats, human_lemmas, "HumanText", "Original", label_suffix)
+        lemma_freq = human_lemmas.most_common(args.top_lemmas)
+        lemma_matrix.extend(("HumanText", "Original", lemma, freq) for lemma, freq in human_lemmas.items())
+
+        results.append({"Model": "HumanText", "TextType": "Original", **human_features})
+        for word, freq in lemma_freq:
+            results.append({"Model": "HumanText", "TextType": "Original", "TopLemma": word, "Frequency": freq})
+        ngram_results.extend(ngram_rows(human_group, NGRAM_ORDERS, "HumanText", "Original"))
+
+        # Modelltexte analysieren
+        for model, texts in model_groups.items():
+            for text_type, group in texts.items():
+                lemmas = group.lemma_counts(wortarten)
+                similarity = similarities[(model, text_type)]
+                features = get_stylometric_features(group.stats, lemmas, model, text_type, label_suffix)
+                lemma_freq = lemmas.most_common(args.top_lemmas)
+                lemma_matrix.extend((model, text_type, lemma, freq) for lemma, freq in lemmas.items())
+
+                results.append({"Model": model, "TextType": text_type, "Similarity": round(similarity, 3), **features})
+                similarity_results.append({"Model": model, "TextType": text_type, "Similarity": round(similarity, 3)})
+                for word, freq in lemma_freq:
+                    results.append({"Model": model, "TextType": text_type, "TopLemma": word, "Frequency": freq})
+                ngram_results.extend(ngram_rows(group, NGRAM_ORDERS, model, text_type))
+
+        # Speichern
+        df_similarity = pd.DataFrame(similarity_results)
+        df_stylometry = pd.DataFrame(results)
+        df_ngrams = pd.DataFrame(ngram_results)
+        df_documents = pd.DataFrame(document_features[label_suffix])
+        df_distribution = group_distributions(df_documents)
+
+        with metrics.stage(f"excel{label_suffix}"):
+            with pd.ExcelWriter(output_filename, engine='openpyxl') as writer:
+                df_similarity.to_excel(writer, sheet_name='Semantische Ähnlichkeit', index=False)
+                df_stylometry.to_excel(writer, sheet_name='Stilometrie', index=False)
+                df_ngrams.to_excel(writer, sheet_name='N-Gramme', index=False)
+                df_distribution.to_excel(writer, sheet_name='Stilometrie Verteilung', index=False)
+                df_similarity_distribution.to_excel(writer, sheet_name='Ähnlichkeit Verteilung', index=False)
+                df_group_similarity.to_excel(writer, sheet_name='Ähnlichkeit Gruppen')
+
+        # Vollständige Modell×Lemma-Matrix (ohne Top-N-Grenze) als Arrow-Datei
+        with metrics.stage(f"arrow{label_suffix}"):
+            matrix_filename = output_filename.replace(".xlsx", "_lemmata.arrow")
+            df_lemmas = pd.DataFrame(lemma_matrix, columns=["Model", "TextType", "Lemma", COUNT_COLUMN])
+            write_count_table(df_lemmas, matrix_filename, "Lemma")
+
+            # Merkmalsvektoren der einzelnen Texte
+            features_filename = output_filename.replace(".xlsx", "_stilometrie.arrow")
+            write_document_features(df_documents, features_filename)
+
+            # Lemma-Häufigkeiten der einzelnen Texte
+            documents = document_lemmas[label_suffix]
+            write_document_matrix(documents.models, documents.text_types, list(documents.vocab), documents.matrix(),
+                                  output_filename.replace(".xlsx", DOCUMENT_MATRIX_SUFFIX))
+
+        print(f"✅ Analyse abgeschlossen und gespeichert unter: {output_filename}, {matrix_filename} und {features_filename}")
+
+    # Gesamtauswertung
+    with metrics.stage("analysis_gesamt"):
+        run_analysis(to_analyze, "textanalyse_gesamt.xlsx")
+
+    # Einzelanalysen
+    for wortart in to_analyze:
+        with metrics.stage(f"analysis_{wortart}"):
+            run_analysis(wortart, f"textanalyse_{wortart}.xlsx")
+
+    metrics.write(METRICS_FILE)
@@ -0,0 +1,175 @@
+import json
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from itertools import cycle, islice
+
+from ..corpus import CORPUS_PATH, iter_texts
+from ..pipeline import DEFAULT_BATCH_SIZE
+
+# Referenzdateien aus main.py bzw. clustering.py
+REFERENCE_PATH = "textanalyse_gesamt_stilometrie.arrow"
+CATEGORY_FOLDER = "Kategorisierungen_Alle"
+
+LOAD_TEST_FILE = "klassifikator_loadtest.json"
+
+DESCRIPTION = "Stilometrie- und Kategorie-Bewertung neuer Texte als Dienst"
+
+
+# Eine Anfrage: {"text": "..."} oder {"texts": [...]}, optional "id" bzw. "ids"
+# (gleich viele wie Texte). Ungültige Anfragen -> ValueError (HTTP 400 bzw. Fehlerzeile)
+def handle_request(classifier, request):
+    if not isinstance(request, dict):
+        raise ValueError("Anfrage muss ein JSON-Objekt sein")
+    if "texts" in request:
+        texts = request["texts"]
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            raise ValueError("'texts' muss eine Liste von Strings sein")
+        ids = request.get("ids", list(range(len(texts))))
+        if not isinstance(ids, list) or len(ids) != len(texts):
+            raise ValueError(f"'ids' muss eine Liste mit {len(texts)} Einträgen sein (eine ID pro Text)")
+    else:
+        if not isinstance(request.get("text"), str):
+            raise ValueError("'text' (String) oder 'texts' (Liste von Strings) fehlt")
+        texts = [request["text"]]
+        ids = [request.get("id")]
+    results = classifier.classify(texts)
+    return {"results": [{"id": text_id, **result} for text_id, result in zip(ids, results)]}
+
+
+# Worker über stdin/stdout: eine JSON-Anfrage pro Zeile, eine Antwort pro Zeile
+def serve_stdin(classifier):
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            response = handle_request(classifier, json.loads(line))
+        except (ValueError, KeyError, TypeError) as error:
+            response = {"error": str(error)}
+        sys.stdout.write(json.dumps(response, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+
+
+def make_handler(classifier):
+    class ClassifierHandler(BaseHTTPRequestHandler):
+        def _send(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, {"status": "ok", "categories": len(classifier.codebook.names)})
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/classify":
+                self._send(404, {"error": "not found"})
+                return
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                self._send(200, handle_request(classifier, request))
+            except (ValueError, KeyError, TypeError) as error:
+                self._send(400, {"error": str(error)})
+
+        def log_message(self, format, *args):
+            pass
+
+    return ClassifierHandler
+
+
+# Lokaler HTTP-Dienst: POST /classify, GET /health. Anfragen werden nacheinander
+# bearbeitet (ein Modell, ein Prozess); Parallelität über mehrere Texte pro Anfrage.
+def make_server(classifier, host, port):
+    return HTTPServer((host, port), make_handler(classifier))
+
+
+# Lasttest gegen den HTTP-Dienst (im selben Prozess, auf einem freien Port):
+# num_requests Anfragen mit je request_size Korpustexten, nach warmup Anfragen zum Aufwärmen
+def load_test(classifier, num_requests, request_size, warmup=5, corpus_path=CORPUS_PATH):
+    import numpy as np
+
+    server = make_server(classifier, "127.0.0.1", 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/classify"
+
+    texts = cycle([text for _, _, _, text in iter_texts(corpus_path)])
+
+    def post(batch):
+        body = json.dumps({"texts": batch}, ensure_ascii=False).encode("utf-8")
+        request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+
+    for _ in range(warmup):
+        post(list(islice(texts, request_size)))
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(num_requests):
+        batch = list(islice(texts, request_size))
+        t0 = time.perf_counter()
+        post(batch)
+        latencies.append(time.perf_counter() - t0)
+    wall = time.perf_counter() - start
+    server.shutdown()
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "requests": num_requests,
+        "texts_per_request": request_size,
+        "wall_s": round(wall, 3),
+        "requests_per_s": round(num_requests / wall, 2),
+        "texts_per_s": round(num_requests * request_size / wall, 2),
+        "latency_ms": {
+            "p50": round(float(np.percentile(latencies_ms, 50)), 2),
+            "p90": round(float(np.percentile(latencies_ms, 90)), 2),
+            "p99": round(float(np.percentile(latencies_ms, 99)), 2),
+            "max": round(float(latencies_ms.max()), 2),
+        },
+    }
+
+
+def add_arguments(parser):
+    parser.add_argument("--reference", default=REFERENCE_PATH,
+                        help="Merkmalsvektoren der Korpustexte (von main.py)")
+    parser.add_argument("--categories", default=CATEGORY_FOLDER,
+                        help="Ordner mit kategorien.json und kategorie_matrix.arrow (von clustering.py)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Anzahl Texte pro Batch in nlp.pipe")
+    parser.add_argument("--http", type=int, metavar="PORT",
+                        help="HTTP-Dienst auf diesem Port starten (sonst JSONL über stdin/stdout)")
+    parser.add_argument("--host", default="127.0.0.1", help="Adresse des HTTP-Dienstes")
+    parser.add_argument("--load-test", type=int, metavar="N",
+                        help="Lasttest mit N Anfragen gegen einen lokalen HTTP-Dienst")
+    parser.add_argument("--request-size", type=int, default=1, help="Texte pro Anfrage im Lasttest")
+    parser.add_argument("--output", default=LOAD_TEST_FILE, help="Ergebnisdatei des Lasttests (JSON)")
+    return parser
+
+
+def run(args):
+    from ..classifier import TextClassifier
+    from ..pipeline import load_nlp
+
+    # Modell, Referenzwerte und Kategorien einmal laden
+    classifier = TextClassifier.load(load_nlp(), args.reference, args.categories, batch_size=args.batch_size)
+    print(f"✅ Klassifikator bereit ({len(classifier.codebook.names)} Kategorien)", file=sys.stderr)
+
+    if args.load_test:
+        result = load_test(classifier, args.load_test, args.request_size)
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2)
+        print(json.dumps(result, indent=2), file=sys.stderr)
+        print(f"📈 Lasttest gespeichert in: {args.output}", file=sys.stderr)
+    elif args.http:
+        server = make_server(classifier, args.host, args.http)
+        print(f"🌐 POST http://{args.host}:{args.http}/classify", file=sys.stderr)
+        server.serve_forever()
+    else:
+        serve_stdin(classifier)
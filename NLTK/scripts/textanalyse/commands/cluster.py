@@ -0,0 +1,376 @@
+from ..metrics import add_metrics_arguments
+from ..pipeline import add_pipe_arguments
+
+# Complete model×category count matrix per output folder
+MATRIX_FILE = "kategorie_matrix.arrow"
+
+# Text×category count matrix per output folder (input of the significance tests)
+DOCUMENT_MATRIX_FILE = "kategorie_texte.npz"
+
+# Version of the cached content lemmas per text – increase when extract_content_lemmas changes
+CACHE_VERSION = 2
+
+# Run metrics (stages, counters, optional profile) next to the Kategorisierungen_* folders
+METRICS_FILE = "clustering_metrics.json"
+
+# POS-Tags
+CONTENT_POS = ["NOUN", "ADJ", "VERB", "ADV", "NOUN, ADJ, VERB, ADV", "ADJ, ADV", "NOUN, VERB"]
+#CONTENT_POS = ["ADJ, ADV", "NOUN, VERB"]
+
+# Output folder per POS configuration
+OUTPUT_FOLDERS = {
+    "NOUN": "Kategorisierungen_N",
+    "ADJ": "Kategorisierungen_A",
+    "VERB": "Kategorisierungen_Verb",
+    "ADV": "Kategorisierungen_Adv",
+    "NOUN, ADJ, VERB, ADV": "Kategorisierungen_Alle",
+    "ADJ, ADV": "Kategorisierungen_ADJADV",
+    "NOUN, VERB": "Kategorisierungen_NOUNVERB",
+}
+
+# Plot of the top 10 categories, shared by all configurations (written by the last one);
+# a threshold sweep writes one plot per threshold (kategorien_top10_vergleich_0.65.png)
+PLOT_FILE = "kategorien_top10_vergleich.png"
+
+
+def plot_file(threshold=None):
+    if threshold is None:
+        return PLOT_FILE
+    name, extension = PLOT_FILE.rsplit(".", 1)
+    return f"{name}_{threshold:g}.{extension}"
+
+DESCRIPTION = "Semantische Kategorien der Korpus-Lemmata"
+
+
+def add_arguments(parser):
+    add_pipe_arguments(parser)
+    add_metrics_arguments(parser)
+    parser.add_argument("--excel-top", type=int, default=100,
+                        help="Die N häufigsten Kategorien nach kategorie_vergleich.xlsx exportieren (0 = kein Excel-Export)")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.7],
+                        help="Ähnlichkeitsschwelle(n) der Kategorien; mehrere Werte ergeben einen Durchlauf "
+                             "mit einem Ausgabeordner und Plot je Schwelle (z. B. Kategorisierungen_Alle_0.65, "
+                             "kategorien_top10_vergleich_0.65.png)")
+    parser.add_argument("--jobs", type=int, default=-1,
+                        help="Anzahl parallel bearbeiteter Wortart-Konfigurationen "
+                             "(-1 = ein Prozess je Konfiguration, höchstens so viele wie CPU-Kerne)")
+    return parser
+
+
+# Excel export limited to the top N categories by occurence (excel might crash otherwise)
+# Only the top N columns of the sparse group matrix are turned into a dense table
+def export_excel(groups, group_matrix, names, feature_order, top_n, outputfolder):
+    import numpy as np
+    import pandas as pd
+
+    totals = np.asarray(group_matrix.sum(axis=0), dtype=float).ravel()
+    gesamt = pd.Series(totals[feature_order], index=feature_order)
+    top_ids = gesamt.sort_values(ascending=False).head(top_n).index.to_numpy()
+
+    df = pd.DataFrame(group_matrix[:, top_ids].toarray().astype(float),
+                      columns=[names[c] for c in top_ids])
+    df.insert(0, "TextType", [text_type for _, text_type in groups])
+    df.insert(0, "Model", [model for model, _ in groups])
+
+    output_path = f"{outputfolder}/kategorie_vergleich.xlsx"
+    df.to_excel(output_path, index=False)
+    print(f"Top {top_n} Kategorien gespeichert in {outputfolder}/kategorie_vergleich.xlsx")
+
+    #Extra Sheet that shows the top occurences of categories for each model type
+    df_long = df.melt(id_vars=["Model", "TextType"], var_name="Kategorie", value_name="Häufigkeit")
+
+    # Only occurences > 0
+    df_long = df_long[df_long["Häufigkeit"] > 0]
+
+    # For each group select top 10
+    top10_per_group = (
+        df_long.sort_values(["Model", "TextType", "Häufigkeit"], ascending=[True, True, False])
+        .groupby(["Model", "TextType"])
+        .head(10)
+    )
+
+    # Export in a new sheet of the same excel-file
+    with pd.ExcelWriter(f"{outputfolder}/kategorie_vergleich.xlsx", mode="a", engine="openpyxl") as writer:
+        top10_per_group.to_excel(writer, sheet_name="Top10_ProModell", index=False)
+
+
+# One POS configuration: content lemmas from the cache, categories for every threshold and
+# all outputs of its Kategorisierungen_* folder(s). Runs in a worker process: the content
+# lemma caches are complete (see run), so neither the model nor the doc store is read, and
+# the vector store is only memory-mapped, i.e. shared read-only between all workers.
+# Returns stages and counters of its own RunMetrics for the metrics of the whole run.
+def cluster_configuration(kat, thresholds, excel_top=100, plot=True, progress=True, trace_memory=False):
+    import os
+    import time
+
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from tqdm import tqdm
+
+    from ..countmatrix import CountMatrixBuilder
+    from ..doccache import DocCache, iter_partials
+    from ..docstore import doc_store_size
+    from ..kategorien import (
+        CODEBOOK_FILE,
+        CategoryLookup,
+        SimilarityGraph,
+        build_global_categories,
+        write_codebook,
+    )
+    from ..lemmafilter import LemmaFilter
+    from ..matrixstore import read_count_matrix, write_document_matrix, write_sparse_matrix
+    from ..metrics import RunMetrics
+    from ..vectorstore import load_vector_store
+
+    # Several thresholds: the lemma similarities are computed once as a sparse graph
+    # at the lowest threshold, every threshold is derived from it
+    sweep = len(thresholds) > 1
+
+    start = time.perf_counter()
+    metrics = RunMetrics(f"clustering:{kat}", trace_memory=trace_memory)
+
+    # Vectors are only mapped into memory; all workers read from the same pages
+    lemma_vectors = load_vector_store()
+
+    outputfolder = OUTPUT_FOLDERS[kat]
+    base_outputfolder = outputfolder
+
+    print(f"Outputfolder for kat {kat}: /{outputfolder}")
+
+    # Function for lemma extraction
+    # Same filter as main.py, restricted to the POS of this run, alphabetic tokens with a vector
+    content_filter = LemmaFilter(pos=kat.split(", "), alpha_only=True, require_vector=True)
+
+    def extract_content_lemmas(doc):
+        return content_filter.lemmas(doc)
+
+    def create_plot(path):
+        # 🔹 Read the full category matrix
+        df = read_count_matrix(f"{outputfolder}/{MATRIX_FILE}")
+
+        #Create a new column with Modell_Texttyp as a unit
+        # 🔹 Erstelle eine neue Spalte mit „Modell_Texttyp“ als Gruppierungseinheit
+        df["Kombi"] = df["Model"] + " – " + df["TextType"]
+
+        # 🔹 Extract Category-Columns (minus meta columns)
+        kategorie_spalten = [col for col in df.columns if col not in ["Model", "TextType", "Kombi"]]
+
+        # 🔹 Calculate occurences of each category type
+        gesamt = df[kategorie_spalten].sum().sort_values(ascending=False)
+
+        # 🔹 select top 10 categories
+        top_10_kategorien = list(gesamt.head(10).index)
+
+        # 🔹 Reframe dataframe for plot
+        df_plot = df[["Kombi"] + top_10_kategorien].set_index("Kombi").T
+
+        # 🔹 Create plot
+        plt.figure(figsize=(14, 6))
+        df_plot.plot(kind="bar", figsize=(16, 8), width=0.85)
+
+        plt.title("Top 10 semantische Kategorien – Häufigkeit pro Modell/Texttyp")
+        plt.ylabel("Häufigkeit")
+        plt.xlabel("Kategorie")
+        plt.xticks(rotation=45)
+        plt.legend(title="Modell – Texttyp", bbox_to_anchor=(1.05, 1), loc="upper left")
+        plt.tight_layout()
+
+        # 🔹 save
+        plt.savefig(path)
+        plt.close("all")
+        print("Plot erstellt!")
+
+    # Content lemmas per text come from the cache, opened read-only (run keeps it up to date)
+    cache = DocCache(f"clustering:{kat}", CACHE_VERSION, read_only=True)
+
+    # Step 1: Collect global lemmas for each model + human
+    global_lemmas = set()
+
+    with metrics.stage(f"{outputfolder}/content_lemmas", unit="texts") as stage:
+        for text_id, model_name, text_type, lemmas in iter_partials(None, cache, extract_content_lemmas):
+            global_lemmas.update(lemmas)
+            stage["items"] += 1
+            metrics.count("texts")
+            metrics.count("content_lemma_tokens", len(lemmas))
+        stage["unique_lemmas"] = len(global_lemmas)
+    metrics.count("unique_lemmas", len(global_lemmas))
+
+    # Lemmas of this run with a vector in the store
+    num_vectors = sum(1 for lemma in global_lemmas if lemma in lemma_vectors)
+    metrics.count("lemmas_with_vector", num_vectors)
+
+    # step 2: Analyze each text -> one sparse row of lemma ids per text; the category
+    # counts of every threshold follow from the lemma counts with one sparse product
+    lemma_counts = CountMatrixBuilder(len(lemma_vectors))
+
+    # Human text and AI-texts are streamed from the doc store in corpus order
+    with metrics.stage(f"{outputfolder}/assign", unit="texts") as stage:
+        for text_id, model_name, text_type, lemmas in tqdm(iter_partials(None, cache, extract_content_lemmas), total=doc_store_size(), desc="📄 Verarbeite Texte", disable=not progress):
+            lemma_counts.add(model_name, text_type, lemma_vectors.rows(lemmas))
+            stage["items"] += 1
+
+        lemma_counts = lemma_counts.build()
+        cache.close()
+
+        # Step 3: Group by model and texttype and add all occurences (sparse indicator product)
+        groups, lemma_group_matrix = lemma_counts.group_sums()
+
+    # Sweep: all lemma pairs above the lowest threshold, once per POS configuration
+    graph = None
+    if sweep:
+        with metrics.stage(f"{outputfolder}/similarity_graph", unit="lemmas") as stage:
+            graph = SimilarityGraph(global_lemmas, lemma_vectors, min(thresholds))
+            stage["items"] = num_vectors
+            stage["edges"] = graph.num_edges
+        metrics.count("similarity_evaluations", num_vectors ** 2)
+        metrics.count("similarity_graph_edges", graph.num_edges)
+
+    for threshold in thresholds:
+        if sweep:
+            outputfolder = f"{base_outputfolder}_{threshold:g}"
+            os.makedirs(outputfolder, exist_ok=True)
+            print(f"Outputfolder for threshold {threshold:g}: /{outputfolder}")
+
+        # step 4: create global categories
+        print("🔍 Kategorisiere globale Lemmata ...")
+        # Create global categories based on a similarity of at least the threshold
+        with metrics.stage(f"{outputfolder}/build_global_categories", unit="lemmas") as stage:
+            if graph is None:
+                categories = build_global_categories(global_lemmas, lemma_vectors, threshold, counters=metrics.counters)
+                # Decide once for each lemma to which category it belongs
+                category_lookup = CategoryLookup(categories, lemma_vectors, global_lemmas)
+                metrics.count("similarity_evaluations", num_vectors * len(category_lookup.names))
+            else:
+                categories, category_lookup = graph.categorise(threshold)
+            stage["items"] = num_vectors
+            stage["categories"] = len(categories)
+        metrics.count("categories", len(categories))
+        print(f"✅ {len(categories)} Kategorien erstellt.")
+
+        # Category counts per model/texttype, columns in order of first occurence
+        mapping_matrix = category_lookup.mapping_matrix()
+        group_matrix = (lemma_group_matrix @ mapping_matrix).tocsr()
+        feature_order = category_lookup.category_order(lemma_counts.feature_order)
+
+        # Save the complete model×category matrix (Arrow IPC, read by the report scripts)
+        with metrics.stage(f"{outputfolder}/arrow"):
+            write_sparse_matrix(groups, category_lookup.names, group_matrix, f"{outputfolder}/{MATRIX_FILE}", "Kategorie",
+                                feature_order)
+            # Category counts of every single text
+            write_document_matrix(lemma_counts.models, lemma_counts.text_types, category_lookup.names,
+                                  lemma_counts.matrix @ mapping_matrix, f"{outputfolder}/{DOCUMENT_MATRIX_FILE}",
+                                  feature_order)
+        print(f"Alle {len(feature_order)} Kategorien gespeichert in {outputfolder}/{MATRIX_FILE}")
+
+        # Optional Excel export of the top N categories
+        if excel_top > 0:
+            with metrics.stage(f"{outputfolder}/excel"):
+                export_excel(groups, group_matrix, category_lookup.names, feature_order, excel_top, outputfolder)
+
+        # Save ALL categroies and their lemmas in a .txt file
+        with open(f"{outputfolder}/globale_kategorien.txt", "w", encoding="utf-8") as f:
+            f.write(f"Gesamtzahl der Kategorien: {len(categories)}")
+            for cat, words in sorted(categories.items()):
+                f.write(f"Kategorie: {cat} ({len(words)} Lemmata)")
+                f.write(", ".join(sorted(words)) + "")
+
+        print(f"📂 Kategorien gespeichert in: {outputfolder}/globale_kategorien.txt")
+
+        # Categories as a machine-readable codebook (used by the classifier service)
+        write_codebook(categories, kat.split(", "), f"{outputfolder}/{CODEBOOK_FILE}")
+
+        if plot:
+            with metrics.stage(f"{outputfolder}/plot"):
+                create_plot(plot_file(threshold if sweep else None))
+
+    metrics.stages.append({"stage": f"{base_outputfolder}/total", "wall_s": round(time.perf_counter() - start, 4)})
+    return metrics.stages, metrics.counters
+
+
+def run(args):
+    import os
+    import time
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    from tqdm import tqdm
+
+    from ..doccache import DocCache, iter_partials
+    from ..docstore import doc_store_entries, doc_store_size, ensure_doc_store
+    from ..lemmafilter import LemmaFilter
+    from ..metrics import RunMetrics
+    from ..pipeline import load_nlp
+    from ..vectorstore import ensure_vector_store, model_required
+
+    metrics = RunMetrics("clustering", profile=args.profile, trace_memory=args.trace_memory)
+
+    # Loading German model (without parser/NER) – only if the doc store, the vector
+    # store or one of the content lemma caches is out of date
+    with metrics.stage("load_model"):
+        caches = [(f"clustering:{kat}", CACHE_VERSION) for kat in CONTENT_POS]
+        nlp = load_nlp() if model_required(caches) else None
+    metrics.count("model_loaded", int(nlp is not None))
+
+    # Parse texts once (shared doc store, see preprocess.py); only new or changed texts are parsed again.
+    # One vector per lemma of the corpus vocabulary, exported once to a memory-mapped store
+    with metrics.stage("doc_store"):
+        if nlp is not None:
+            ensure_doc_store(nlp, n_process=args.n_process, batch_size=args.batch_size)
+            ensure_vector_store(nlp)
+
+    # Content lemmas of new or changed texts are extracted here, once, with the model,
+    # and entries of texts no longer in the corpus are removed; the workers only open
+    # the caches read-only and never load the model themselves
+    if nlp is not None:
+        for kat in CONTENT_POS:
+            cache = DocCache(f"clustering:{kat}", CACHE_VERSION)
+            content_filter = LemmaFilter(pos=kat.split(", "), alpha_only=True, require_vector=True)
+            with metrics.stage(f"{OUTPUT_FOLDERS[kat]}/content_lemma_cache", unit="texts") as stage:
+                for _ in iter_partials(nlp, cache, content_filter.lemmas, metrics=metrics):
+                    stage["items"] += 1
+            cache.close()
+        del nlp
+    else:
+        keys = [key for key, *_ in doc_store_entries()]
+        for kat in CONTENT_POS:
+            cache = DocCache(f"clustering:{kat}", CACHE_VERSION)
+            cache.retain(keys)
+            cache.close()
+        metrics.count("texts_cached", doc_store_size() * len(CONTENT_POS))
+
+    # Configurations with the most POS tags (largest vocabularies) are scheduled first,
+    # so the longest one never waits for a free worker at the end
+    configurations = sorted(CONTENT_POS, key=lambda kat: len(kat.split(", ")), reverse=True)
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    jobs = min(jobs, len(configurations))
+    metrics.count("jobs", jobs)
+
+    # All configurations share one top-10 plot; as before, the last one in CONTENT_POS wins
+    def options(kat):
+        return dict(thresholds=args.thresholds, excel_top=args.excel_top, plot=kat == CONTENT_POS[-1],
+                    progress=jobs == 1, trace_memory=args.trace_memory)
+
+    def collect(result):
+        stages, counters = result
+        metrics.stages.extend(stages)
+        metrics.counters.update(counters)
+
+    with metrics.stage("configurations", unit="configurations") as stage:
+        if jobs == 1:
+            for kat in CONTENT_POS:
+                collect(cluster_configuration(kat, **options(kat)))
+                stage["items"] += 1
+        else:
+            # Per-configuration progress: one line per finished configuration
+            print(f"⚙️ {len(configurations)} POS-Konfigurationen in {jobs} Prozessen")
+            start = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = {pool.submit(cluster_configuration, kat, **options(kat)): kat for kat in configurations}
+                progress = tqdm(as_completed(futures), total=len(futures), desc="🗂️ Konfigurationen")
+                for future in progress:
+                    kat = futures[future]
+                    collect(future.result())
+                    stage["items"] += 1
+                    progress.write(f"✅ {OUTPUT_FOLDERS[kat]} ({kat}) fertig nach {time.perf_counter() - start:.1f} s")
+
+    metrics.write(METRICS_FILE)
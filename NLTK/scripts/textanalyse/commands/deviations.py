@@ -0,0 +1,82 @@
+# Kategorie-Ordner von clustering.py
+FOLDERS = ["Kategorisierungen_A", "Kategorisierungen_Adv", "Kategorisierungen_Alle", "Kategorisierungen_N", "Kategorisierungen_Verb", "Kategorisierungen_NOUNVERB", "Kategorisierungen_ADJADV"]
+
+# Anzahl Über- bzw. Unterrepräsentationen je Ausgabe
+TOP_K = 30
+
+DESCRIPTION = "Top 30 über- und unterrepräsentierte Kategorien je Modell/Texttyp"
+
+
+def add_arguments(parser):
+    parser.add_argument("--folders", nargs="+", default=FOLDERS,
+                        help="Kategorisierungen_*-Ordner mit kategorie_matrix.arrow")
+    parser.add_argument("--top-k", type=int, nargs="+", default=[TOP_K],
+                        help="Anzahl Über- und Unterrepräsentationen; mehrere Werte ergeben je k eine Textdatei "
+                             "und einen Plot (k ungleich 30 mit der Endung _top<k>)")
+    return parser
+
+
+def run(args):
+    import os
+
+    import matplotlib.pyplot as plt
+
+    from ..deviations import CategoryDeviations
+
+    # 📁 Dateipfade
+    doc = "kategorie_matrix.arrow"
+
+    for dir in args.folders:
+        file_path = os.path.join(dir, doc)
+
+        print(f"📂 Öffne Datei: {file_path}")
+
+        # 📥 Vollständige Kategorie-Matrix laden (alle Kategorien, nicht nur Top 100)
+        # ➖ Abweichungen vom globalen Mittel aller Zellen auf einmal berechnen
+        deviations = CategoryDeviations.from_file(file_path)
+
+        # 🔝 Top k positive & negative Abweichungen – einmal für das größte k,
+        # kleinere k sind Präfixe davon
+        max_k = max(args.top_k)
+        top_pos = deviations.rows(deviations.top(max_k))
+        top_neg = deviations.rows(deviations.bottom(max_k))
+
+        for k in args.top_k:
+            suffix = "" if k == TOP_K else f"_top{k}"
+            output_path = os.path.join(dir, f"abweichungen_kategorien{suffix}.txt")
+            plot_path = os.path.join(dir, f"abweichungen_kategorien{suffix}_plot.png")
+            pos, neg = top_pos[:k], top_neg[:k]
+
+            # 📄 Textdatei schreiben
+            with open(output_path, "w", encoding="utf-8") as file:
+                file.write(f"Top {k} Überrepräsentationen:\n\n")
+                for modell_typ, kategorie, absolut, prozent in pos:
+                    file.write(f"{modell_typ} – {kategorie}\n")
+                    file.write(f"  ➤ Abweichung absolut: +{absolut:.2f}\n")
+                    file.write(f"  ➤ Abweichung prozentual: +{prozent:.2f}%\n\n")
+
+                file.write(f"\nTop {k} Unterrepräsentationen:\n\n")
+                for modell_typ, kategorie, absolut, prozent in neg:
+                    file.write(f"{modell_typ} – {kategorie}\n")
+                    file.write(f"  ➤ Abweichung absolut: {absolut:.2f}\n")
+                    file.write(f"  ➤ Abweichung prozentual: {prozent:.2f}%\n\n")
+
+            print("✅ Abweichungen wurden gespeichert unter:", output_path)
+
+            # 📊 Balkendiagramm erstellen
+            top_combined = neg + pos
+            labels = [f"{modell_typ} – {kategorie}" for modell_typ, kategorie, _, _ in top_combined]
+            values = [absolut for _, _, absolut, _ in top_combined]
+            colors = ["crimson" if v < 0 else "steelblue" for v in values]
+
+            plt.figure(figsize=(12, 12))
+            plt.barh(labels, values, color=colors)
+            plt.axvline(0, color="black", linewidth=0.8)
+            plt.xlabel("Abweichung zur Durchschnittsnutzung")
+            plt.title(f"Top {k} Über- und Unterrepräsentierte Kategorien")
+            plt.gca().invert_yaxis()
+            plt.tight_layout()
+            plt.savefig(plot_path)
+            plt.close()
+
+            print("📊 Diagramm gespeichert unter:", plot_path)
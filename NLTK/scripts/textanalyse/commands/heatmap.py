@@ -0,0 +1,69 @@
+from .deviations import FOLDERS
+
+# 📌 Anzahl der Kategorien in der Heatmap (häufigste zuerst, 0 = alle)
+TOP_N = 0
+# 📌 Spalten der ersten Ansicht; feinere Details lädt die Heatmap beim Zoomen
+MAX_COLUMNS = 1000
+
+DESCRIPTION = "Interaktive Heatmap der Kategorien je Modell/Texttyp, nach Ähnlichkeit geordnet"
+
+
+def add_arguments(parser):
+    parser.add_argument("--folders", nargs="+", default=FOLDERS,
+                        help="Kategorisierungen_*-Ordner mit kategorie_matrix.arrow")
+    parser.add_argument("--top-n", type=int, default=TOP_N,
+                        help="Anzahl Kategorien in der Heatmap (häufigste zuerst, 0 = alle)")
+    parser.add_argument("--order", choices=["similarity", "alphabetical"], default="similarity",
+                        help="Reihenfolge der Kategorien: ähnliche nebeneinander oder alphabetisch")
+    parser.add_argument("--max-columns", type=int, default=MAX_COLUMNS,
+                        help="Höchstzahl gleichzeitig gezeichneter Spalten; breitere Ausschnitte werden über "
+                             "benachbarte Kategorien gemittelt")
+    parser.add_argument("--plotlyjs", choices=["inline", "cdn", "directory"], default="inline",
+                        help="plotly.js in jede Datei einbetten, vom CDN laden oder auf eine plotly.min.js "
+                             "daneben verweisen")
+    return parser
+
+
+def run(args):
+    import os
+
+    import numpy as np
+
+    from ..heatmap import category_vectors, similarity_order, write_heatmap
+    from ..kategorien import CODEBOOK_FILE, read_codebook
+    from ..matrixstore import read_sparse_matrix
+    from ..vectorstore import VECTOR_STORE_PATH, load_vector_store
+
+    lemma_vectors = load_vector_store() if os.path.exists(VECTOR_STORE_PATH) else None
+    include_plotlyjs = {"inline": True, "cdn": "cdn", "directory": "directory"}[args.plotlyjs]
+
+    for ordner in args.folders:
+        groups, categories, matrix = read_sparse_matrix(f"{ordner}/kategorie_matrix.arrow")
+        values = matrix.toarray()
+
+        # 🔝 Top-N Kategorien
+        columns = np.argsort(-values.sum(axis=0), kind="stable")
+        if args.top_n > 0:
+            columns = columns[:args.top_n]
+        names = [categories[c] for c in columns]
+        values = values[:, columns]
+
+        # 🔁 Ähnliche Kategorien nebeneinander: Richtung des Clusters aus dem Vektor-Store,
+        # ohne Vektor-Store das Häufigkeitsprofil über Modelle/Texttypen
+        if args.order == "alphabetical":
+            order = np.argsort(np.asarray(names, dtype=object), kind="stable")
+        elif lemma_vectors is not None:
+            codebook_path = os.path.join(ordner, CODEBOOK_FILE)
+            clusters = read_codebook(codebook_path)[1] if os.path.exists(codebook_path) else None
+            order = similarity_order(category_vectors(names, lemma_vectors, clusters))
+        else:
+            order = similarity_order(values.T)
+        names = [names[c] for c in order]
+        values = values[:, order]
+
+        path = f"{ordner}/interaktive_heatmap.html"
+        write_heatmap(path, [f"{model} – {text_type}" for model, text_type in groups], names, values,
+                      max_columns=args.max_columns, title="Heatmap: Semantic categories per model",
+                      include_plotlyjs=include_plotlyjs)
+        print(f"✅ Heatmap mit {len(names)} Kategorien gespeichert unter: {path} "
+              f"({os.path.getsize(path) / 1024:.0f} KB)")
@@ -0,0 +1,81 @@
+from .analyze import DOCUMENT_MATRIX_SUFFIX
+from .cluster import DOCUMENT_MATRIX_FILE
+from .deviations import FOLDERS, TOP_K
+
+# Text×Lemma-Matrizen von main.py, die standardmäßig mitgetestet werden
+LEMMA_MATRICES = [f"textanalyse_gesamt{DOCUMENT_MATRIX_SUFFIX}"]
+
+# Permutationen je Test und Niveau der Konfidenzintervalle
+RESAMPLES = 10000
+CONFIDENCE = 0.95
+
+DESCRIPTION = ("Permutations-p-Werte und Konfidenzintervalle (Normalintervalle in geschlossener Form, "
+               "nicht per Resampling) der Kategorie- und Lemma-Abweichungen")
+
+
+def add_arguments(parser):
+    parser.add_argument("--folders", nargs="+", default=FOLDERS,
+                        help=f"Kategorisierungen_*-Ordner mit {DOCUMENT_MATRIX_FILE}")
+    parser.add_argument("--lemma-matrices", nargs="*", default=LEMMA_MATRICES,
+                        help=f"Text×Lemma-Matrizen von main.py (*{DOCUMENT_MATRIX_SUFFIX}); keine = nur Kategorien")
+    parser.add_argument("--resamples", type=int, default=RESAMPLES,
+                        help="Anzahl Permutationen der Gruppenzugehörigkeit je Test (Laufzeit wächst linear "
+                             "mit Permutationen und Texten)")
+    parser.add_argument("--confidence", type=float, default=CONFIDENCE,
+                        help="Niveau der Konfidenzintervalle (Normalintervalle in geschlossener Form, nicht per "
+                             "Resampling)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Startwert der Permutationen (gleicher Startwert = gleiche p-Werte)")
+    parser.add_argument("--top-k", type=int, default=TOP_K,
+                        help="Anzahl Über- und Unterrepräsentationen in der Textdatei")
+    return parser
+
+
+def run(args):
+    import os
+    import time
+
+    from pyarrow import feather
+
+    from ..matrixstore import read_document_matrix
+    from ..significance import DeviationSignificance
+
+    def write_report(result, k, path):
+        percent = f"{result.confidence * 100:g}%-KI"
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(f"{result.resamples} Permutationen (nur für die p-Werte), {percent} als Normalintervall in "
+                       f"geschlossener Form, nicht per Resampling (Standardfehler beim Ziehen mit Zurücklegen je "
+                       f"Gruppe), q = p-Wert nach Benjamini-Hochberg über alle Zellen\n\n")
+            for title, cells, sign in [("Überrepräsentationen", result.deviations.top(k), "+"),
+                                       ("Unterrepräsentationen", result.deviations.bottom(k), "")]:
+                file.write(f"Top {k} {title}:\n\n")
+                for gruppe, merkmal, absolut, prozent, unten, oben, p, q in result.rows(cells):
+                    file.write(f"{gruppe} – {merkmal}\n")
+                    file.write(f"  ➤ Abweichung absolut: {sign}{absolut:.2f} ({percent}: {unten:.2f} bis {oben:.2f})\n")
+                    file.write(f"  ➤ Abweichung prozentual: {sign}{prozent:.2f}%\n")
+                    file.write(f"  ➤ p = {p:.4f}, q = {q:.4f}\n\n")
+                file.write("\n")
+
+    def test(matrix_path, feature, table_path, report_path):
+        if not os.path.exists(matrix_path):
+            print(f"⚠️ {matrix_path} fehlt – bitte zuerst main.py bzw. clustering.py ausführen")
+            return
+
+        print(f"📂 Öffne Datei: {matrix_path}")
+        counts, features = read_document_matrix(matrix_path)
+        start = time.perf_counter()
+        result = DeviationSignificance(counts, features).test(args.resamples, args.confidence, args.seed)
+        print(f"🎲 {args.resamples} Permutationen über {counts.shape[0]} Texte × {len(features)} Merkmale "
+              f"in {time.perf_counter() - start:.1f} s")
+
+        feather.write_feather(result.table(feature), table_path, compression="uncompressed")
+        write_report(result, args.top_k, report_path)
+        print(f"✅ Signifikanz gespeichert unter: {table_path} und {report_path}")
+
+    for folder in args.folders:
+        test(os.path.join(folder, DOCUMENT_MATRIX_FILE), "Kategorie",
+             os.path.join(folder, "signifikanz_kategorien.arrow"), os.path.join(folder, "signifikanz_kategorien.txt"))
+
+    for matrix_path in args.lemma_matrices:
+        base = matrix_path[:-len(DOCUMENT_MATRIX_SUFFIX)] if matrix_path.endswith(DOCUMENT_MATRIX_SUFFIX) else matrix_path
+        test(matrix_path, "Lemma", f"{base}_signifikanz.arrow", f"{base}_signifikanz.txt")
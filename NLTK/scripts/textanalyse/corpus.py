@@ -0,0 +1,99 @@
+import json
+import re
+
+CORPUS_PATH = "./corpus/texte.json"
+TEXT_TYPES = ["TextA", "TextB"]
+
+HUMAN_MODEL = "HumanText"
+HUMAN_TEXT_TYPE = "Original"
+
+# Lesegröße für das inkrementelle Einlesen von texte.json
+READ_CHUNK_SIZE = 1 << 16
+
+
+# Bereinige Text
+def clean_text(text):
+    return re.sub(r"\s+", " ", text.replace("\n", " ")).strip()
+
+
+# Liest ein JSON-Array Element für Element, ohne die ganze Datei zu laden.
+# Im Puffer liegt höchstens das aktuelle Thema plus ein Lese-Block.
+# Ein Element gilt erst als vollständig, wenn danach Leerraum, ',' oder ']' gelesen
+# ist (sonst würde z. B. eine an der Blockgrenze geteilte Zahl zu früh enden);
+# zwischen den Elementen muss genau ein Komma stehen.
+def _iter_json_array(file, chunk_size=READ_CHUNK_SIZE):
+    decoder = json.JSONDecoder()
+    buffer = ""
+    eof = False
+
+    # Hängt den nächsten Block an; False am Dateiende
+    def read_more():
+        nonlocal buffer, eof
+        chunk = file.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+        return not eof
+
+    # Nächstes Zeichen nach Leerraum ("" am Dateiende)
+    def peek():
+        nonlocal buffer
+        while True:
+            buffer = buffer.lstrip()
+            if buffer or not read_more():
+                return buffer[:1]
+
+    if peek() != "[":
+        raise ValueError("Korpus muss ein JSON-Array von Themen sein")
+    buffer = buffer[1:]
+    if peek() == "]":
+        return
+
+    while True:
+        if not peek():
+            raise ValueError("Korpus endet mitten im JSON-Array")
+        while True:
+            try:
+                obj, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if not read_more():
+                    raise
+                continue
+            rest = buffer[end:]
+            if (rest[:1].isspace() or rest[:1] in (",", "]")) and rest.strip() or not read_more():
+                break
+        yield obj
+        buffer = buffer[end:]
+
+        delimiter = peek()
+        if delimiter == "]":
+            return
+        if delimiter != ",":
+            raise ValueError(f"Korpus: ',' oder ']' nach einem Element erwartet, nicht {delimiter or 'Dateiende'!r}")
+        buffer = buffer[1:]
+
+
+# Themen-Objekte aus texte.json (JSON-Array) oder texte.jsonl (ein Thema pro Zeile)
+def iter_topics(path=CORPUS_PATH):
+    with open(path, "r", encoding="utf-8") as file:
+        if path.endswith(".jsonl"):
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from _iter_json_array(file)
+
+
+# Alle Texte des Korpus als (text_id, Modell, Texttyp, Text), als Generator
+# text_id ist die Position des Themas im Korpus (authorkey ist nicht eindeutig)
+def iter_texts(path=CORPUS_PATH):
+    for text_id, obj in enumerate(iter_topics(path)):
+        humantext = clean_text(obj.get("humanText", ""))
+        if humantext:
+            yield text_id, HUMAN_MODEL, HUMAN_TEXT_TYPE, humantext
+
+        for model_name, content in obj.items():
+            if isinstance(content, dict):
+                for text_type in TEXT_TYPES:
+                    text = clean_text(content.get(text_type, ""))
+                    if text:
+                        yield text_id, model_name, text_type, text
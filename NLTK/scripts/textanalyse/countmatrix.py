@@ -0,0 +1,73 @@
+import numpy as np
+from scipy import sparse
+
+
+# Dokument×Merkmal-Zählmatrix: Merkmale (Kategorien, Lemmata) als Integer-IDs,
+# Zählungen als scipy.sparse CSR, Modell/Texttyp als Metadaten je Dokument.
+# Speicher wächst mit der Zahl der Nicht-Null-Einträge, nicht mit Dokumente × Merkmale.
+class CountMatrix:
+    def __init__(self, matrix, models, text_types, feature_order=None):
+        self.matrix = sparse.csr_matrix(matrix)
+        self.models = np.asarray(models, dtype=object)
+        self.text_types = np.asarray(text_types, dtype=object)
+        # Merkmal-IDs in der Reihenfolge ihres ersten Vorkommens im Korpus
+        if feature_order is None:
+            feature_order = np.flatnonzero(np.asarray(self.matrix.sum(axis=0)).ravel())
+        self.feature_order = np.asarray(feature_order, dtype=np.int64)
+
+    @property
+    def shape(self):
+        return self.matrix.shape
+
+    # Summen je (Modell, Texttyp) als dünnbesetztes Matrixprodukt Indikator × Zählungen.
+    # Gruppen sortiert wie bei groupby(["Model", "TextType"])
+    def group_sums(self):
+        keys = list(zip(self.models, self.text_types))
+        groups = sorted(set(keys))
+        position = {group: i for i, group in enumerate(groups)}
+        rows = np.fromiter((position[key] for key in keys), dtype=np.int64, count=len(keys))
+
+        indicator = sparse.csr_matrix(
+            (np.ones(len(keys), dtype=self.matrix.dtype), (rows, np.arange(len(keys)))),
+            shape=(len(groups), len(keys)),
+        )
+        return groups, (indicator @ self.matrix).tocsr()
+
+
+# Baut eine CountMatrix Dokument für Dokument auf
+class CountMatrixBuilder:
+    def __init__(self, n_features):
+        self.n_features = n_features
+        self.indptr = [0]
+        self.indices = []
+        self.data = []
+        self.models = []
+        self.text_types = []
+        self._seen = np.zeros(n_features, dtype=bool)
+        self._feature_order = []
+
+    # ids: Merkmal-ID jedes Vorkommens im Text, in Textreihenfolge
+    def add(self, model, text_type, ids):
+        ids = np.asarray(ids, dtype=np.int64)
+        features, first, counts = np.unique(ids, return_index=True, return_counts=True)
+
+        self.indices.append(features)
+        self.data.append(counts)
+        self.indptr.append(self.indptr[-1] + len(features))
+        self.models.append(model)
+        self.text_types.append(text_type)
+
+        new = ~self._seen[features]
+        if new.any():
+            new_features = features[new][np.argsort(first[new], kind="stable")]
+            self._feature_order.extend(new_features.tolist())
+            self._seen[new_features] = True
+
+    def build(self):
+        indices = np.concatenate(self.indices) if self.indices else np.zeros(0, dtype=np.int64)
+        data = np.concatenate(self.data) if self.data else np.zeros(0, dtype=np.int64)
+        matrix = sparse.csr_matrix(
+            (data, indices, np.asarray(self.indptr, dtype=np.int64)),
+            shape=(len(self.models), self.n_features),
+        )
+        return CountMatrix(matrix, self.models, self.text_types, self._feature_order)
@@ -0,0 +1,58 @@
+import numpy as np
+from scipy import sparse
+
+from .matrixstore import read_sparse_matrix
+
+
+# Abweichung jeder Zelle der Gruppe×Kategorie-Matrix vom Mittel der Kategorie über alle
+# Gruppen (Modell/Texttyp), absolut und in Prozent – per Broadcasting auf der ganzen
+# Matrix, ohne Langform-Tabellen. Zellen sind zeilenweise nummeriert (Gruppe, dann
+# Kategorie in Spaltenreihenfolge der Matrix).
+class CategoryDeviations:
+    def __init__(self, groups, features, matrix):
+        self.groups = [f"{model} – {text_type}" for model, text_type in groups]
+        self.features = list(features)
+        counts = np.asarray(matrix.toarray() if sparse.issparse(matrix) else matrix, dtype=np.float64)
+
+        self.means = counts.mean(axis=0)
+        self.absolute = counts - self.means
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.relative = self.absolute / self.means * 100
+
+    @classmethod
+    def from_file(cls, path):
+        return cls(*read_sparse_matrix(path))
+
+    @property
+    def size(self):
+        return self.absolute.size
+
+    # Die k Zellen mit der größten (largest=True) bzw. kleinsten absoluten Abweichung,
+    # sortiert; argpartition wählt sie aus, sortiert werden nur diese k Werte.
+    # Gleichstände in Zellreihenfolge, daher ist top(k) ein Präfix von top(k + 1).
+    def top(self, k, largest=True):
+        values = self.absolute.ravel()
+        if largest:
+            values = -values
+        k = min(k, values.size)
+        if k == 0:
+            return np.zeros(0, dtype=np.int64)
+        if k < values.size:
+            # Alle Zellen mit dem k-ten Wert mitnehmen, damit Gleichstände an der
+            # Grenze nach Zellreihenfolge entschieden werden
+            kth = values[np.argpartition(values, k - 1)[k - 1]]
+            cells = np.flatnonzero(values <= kth)
+        else:
+            cells = np.arange(values.size)
+        return cells[np.lexsort((cells, values[cells]))][:k]
+
+    def bottom(self, k):
+        return self.top(k, largest=False)
+
+    # (Gruppe, Kategorie, absolut, prozentual) je Zelle
+    def rows(self, cells):
+        group, feature = np.divmod(cells, len(self.features))
+        return [
+            (self.groups[g], self.features[f], self.absolute[g, f], self.relative[g, f])
+            for g, f in zip(group, feature)
+        ]
@@ -0,0 +1,96 @@
+import pickle
+import sqlite3
+
+from .docstore import STORE_PATH, doc_store_entries, iter_doc_store
+
+CACHE_PATH = "./corpus/analyse_cache.sqlite"
+
+
+# Zwischenergebnisse je Text (Lemmata, gefilterte Lemma-Listen, n-Gramme,
+# Satz-/Wortsummen), Schlüssel = Inhaltsschlüssel aus dem Doc-Store.
+# namespace trennt die Analysen (z. B. "main", "clustering:NOUN"); ändert sich
+# version (Filter, n-Gramm-Ordnungen ...), werden die alten Einträge verworfen.
+# read_only öffnet die Datenbank nur lesend (z. B. in parallelen Prozessen): kein
+# Anlegen, Aufräumen oder Schreiben, Einträge anderer Versionen werden übergangen.
+class DocCache:
+    def __init__(self, namespace, version, path=CACHE_PATH, read_only=False):
+        self.namespace = namespace
+        self.version = str(version)
+        self.read_only = read_only
+        if read_only:
+            self.connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            return
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS partials ("
+            "namespace TEXT, version TEXT, key TEXT, value BLOB, PRIMARY KEY (namespace, key))"
+        )
+        self.connection.execute(
+            "DELETE FROM partials WHERE namespace = ? AND version != ?", (self.namespace, self.version)
+        )
+        self.connection.commit()
+
+    def keys(self):
+        rows = self.connection.execute(
+            "SELECT key FROM partials WHERE namespace = ? AND version = ?", (self.namespace, self.version)
+        )
+        return {key for key, in rows}
+
+    def get(self, key):
+        row = self.connection.execute(
+            "SELECT value FROM partials WHERE namespace = ? AND key = ? AND version = ?",
+            (self.namespace, key, self.version),
+        ).fetchone()
+        return None if row is None else pickle.loads(row[0])
+
+    def put(self, key, value):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO partials VALUES (?, ?, ?, ?)",
+            (self.namespace, self.version, key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)),
+        )
+
+    # Entfernt Einträge von Texten, die nicht mehr im Korpus sind
+    def retain(self, keys):
+        stale = self.keys() - set(keys)
+        self.connection.executemany(
+            "DELETE FROM partials WHERE namespace = ? AND key = ?", ((self.namespace, key) for key in stale)
+        )
+
+    def commit(self):
+        self.connection.commit()
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+
+# Generator über (text_id, Modell, Texttyp, Zwischenergebnis) in Korpus-Reihenfolge.
+# compute(doc) läuft nur für Texte ohne Cache-Eintrag; nur dann wird der Doc-Store
+# überhaupt gelesen. Alle anderen Ergebnisse kommen aus dem Cache.
+# metrics (optional, RunMetrics) zählt Texte aus dem Cache und neu analysierte Texte.
+# Ein schreibbarer Cache wird danach auf die Texte des Korpus beschränkt.
+def iter_partials(nlp, cache, compute, store_path=STORE_PATH, metrics=None):
+    entries = doc_store_entries(store_path)
+    missing = {key for key, *_ in entries} - cache.keys()
+    docs = iter_doc_store(nlp, store_path) if missing else None
+
+    num_missing = sum(1 for key, *_ in entries if key in missing)
+    if missing:
+        print(f"♻️ {len(entries) - num_missing} Texte aus dem Cache ({cache.namespace}), {num_missing} neu analysiert")
+    if metrics is not None:
+        metrics.count("texts_cached", len(entries) - num_missing)
+        metrics.count("texts_analysed", num_missing)
+
+    for key, text_id, model, text_type in entries:
+        if missing:
+            doc = next(docs)[3]
+        if key in missing:
+            partial = compute(doc)
+            cache.put(key, partial)
+        else:
+            partial = cache.get(key)
+        yield text_id, model, text_type, partial
+
+    if not cache.read_only:
+        cache.retain(key for key, *_ in entries)
+        cache.commit()
@@ -0,0 +1,226 @@
+import numpy as np
+import pandas as pd
+from pyarrow import feather
+from scipy import sparse
+
+from .corpus import HUMAN_MODEL
+
+# Zeilen je Block beim Berechnen der Dokument×Dokument-Ähnlichkeiten
+# (ein Block belegt block_size × Anzahl Texte float32)
+DEFAULT_BLOCK_SIZE = 1024
+
+# Anzahl der ähnlichsten Texte je Text
+DEFAULT_NEIGHBOURS = 10
+
+# Quantile der Ähnlichkeitsverteilungen
+QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95]
+
+
+# Gefilterte Lemma-Häufigkeiten jedes Textes als dünnbesetzte Text×Lemma-Matrix,
+# Text für Text in Korpus-Reihenfolge aufgebaut
+class DocumentLemmaCounts:
+    def __init__(self):
+        self.vocab = {}
+        self.indptr = [0]
+        self.indices = []
+        self.data = []
+        self.text_ids = []
+        self.models = []
+        self.text_types = []
+
+    def __len__(self):
+        return len(self.models)
+
+    def add(self, text_id, model, text_type, lemma_counts):
+        vocab = self.vocab
+        self.indices.extend(vocab.setdefault(lemma, len(vocab)) for lemma in lemma_counts)
+        self.data.extend(lemma_counts.values())
+        self.indptr.append(len(self.indices))
+        self.text_ids.append(text_id)
+        self.models.append(model)
+        self.text_types.append(text_type)
+
+    def matrix(self):
+        return sparse.csr_matrix(
+            (np.asarray(self.data, dtype=np.float32), np.asarray(self.indices, dtype=np.int64),
+             np.asarray(self.indptr, dtype=np.int64)),
+            shape=(len(self.models), len(self.vocab)),
+        )
+
+    # Mittelvektor je Text (wie LemmaVectors.average_vector_counts) als eine
+    # dünnbesetzte Multiplikation; weights = Anzahl Lemmata mit Vektor je Text
+    def document_vectors(self, lemma_vectors):
+        rows = np.fromiter((lemma_vectors.index.get(lemma, -1) for lemma in self.vocab),
+                           dtype=np.int64, count=len(self.vocab))
+        has_vector = np.flatnonzero(rows >= 0)
+        rows = rows[has_vector]
+
+        counts = self.matrix()[:, has_vector]
+        weights = np.asarray(counts.sum(axis=1), dtype=np.float32).ravel()
+        sums = counts.multiply(lemma_vectors.norms[rows]).tocsr() @ lemma_vectors.matrix[rows]
+        vectors = np.asarray(sums, dtype=np.float32) / np.where(weights > 0, weights, 1)[:, None]
+        return vectors, weights
+
+
+# Zeilenweise L2-normalisiert; Nullvektoren bleiben null (Ähnlichkeit 0)
+def normalise_rows(vectors):
+    norms = np.linalg.norm(vectors, axis=1)
+    return (vectors / np.where(norms > 0, norms, 1)[:, None]).astype(np.float32)
+
+
+# Gewichteter Mittelvektor je Gruppe (Modell, Texttyp) aus den Textvektoren –
+# derselbe Vektor wie der Mittelwert über alle Lemma-Vorkommen der Gruppe
+def group_vectors(vectors, weights, models, text_types, groups):
+    position = {group: i for i, group in enumerate(groups)}
+    rows = np.fromiter((position.get(key, -1) for key in zip(models, text_types)), dtype=np.int64, count=len(models))
+    member = np.flatnonzero(rows >= 0)
+    indicator = sparse.csr_matrix(
+        (weights[member], (rows[member], member)), shape=(len(groups), len(models))
+    )
+    totals = np.asarray(indicator.sum(axis=1)).ravel()
+    return np.asarray(indicator @ vectors) / np.where(totals > 0, totals, 1)[:, None]
+
+
+# Vollständige Kosinus-Matrix Text×Text als .npy (float16, memory-mappable),
+# blockweise berechnet: pro Block ein Matrixprodukt, nie die ganze Matrix im Speicher
+def write_similarity_matrix(unit, path, block_size=DEFAULT_BLOCK_SIZE, dtype=np.float16):
+    n = unit.shape[0]
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(n, n))
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        out[start:stop] = unit[start:stop] @ unit.T
+    out.flush()
+    del out
+
+
+# Die k ähnlichsten anderen Texte jedes Textes (absteigend, Gleichstände nach
+# Korpus-Reihenfolge), blockweise wie write_similarity_matrix, aber mit n·k statt n²
+# Werten auf der Platte
+def nearest_neighbours(unit, text_ids, models, text_types, k=DEFAULT_NEIGHBOURS, block_size=DEFAULT_BLOCK_SIZE):
+    n = unit.shape[0]
+    k = min(k, n - 1)
+    if k <= 0:
+        source = neighbour = np.zeros(0, dtype=np.int64)
+        similarity = np.zeros(0, dtype=np.float32)
+    else:
+        source, neighbour, similarity = [], [], []
+        for start in range(0, n, block_size):
+            stop = min(start + block_size, n)
+            block = unit[start:stop] @ unit.T
+            block[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+            top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+            values = np.take_along_axis(block, top, axis=1)
+            order = np.lexsort((top, -values), axis=1)
+            source.append(np.repeat(np.arange(start, stop), k))
+            neighbour.append(np.take_along_axis(top, order, axis=1).ravel())
+            similarity.append(np.take_along_axis(values, order, axis=1).ravel())
+        source, neighbour, similarity = np.concatenate(source), np.concatenate(neighbour), np.concatenate(similarity)
+
+    text_ids = np.asarray(text_ids)
+    models = np.asarray(models, dtype=object)
+    text_types = np.asarray(text_types, dtype=object)
+    return pd.DataFrame({
+        "TextID": text_ids[source], "Model": models[source], "TextType": text_types[source],
+        "Rang": np.tile(np.arange(1, k + 1), n) if k > 0 else np.zeros(0, dtype=np.int64),
+        "TextID_Nachbar": text_ids[neighbour], "Model_Nachbar": models[neighbour],
+        "TextType_Nachbar": text_types[neighbour],
+        "Similarity": similarity.astype(np.float32),
+    })
+
+
+# Mittlere Kosinus-Ähnlichkeit über alle Textpaare je Gruppenpaar (themenübergreifend),
+# exakt aus den Summenvektoren der Gruppen: Σ_a·Σ_b / (n_a·n_b), auf der Diagonale
+# ohne die Paare eines Textes mit sich selbst
+def group_similarity(unit, models, text_types):
+    keys = list(zip(models, text_types))
+    groups = list(dict.fromkeys(keys))
+    position = {group: i for i, group in enumerate(groups)}
+    rows = np.fromiter((position[key] for key in keys), dtype=np.int64, count=len(keys))
+    indicator = sparse.csr_matrix(
+        (np.ones(len(keys), dtype=np.float32), (rows, np.arange(len(keys)))), shape=(len(groups), len(keys))
+    )
+
+    sums = np.asarray(indicator @ unit, dtype=np.float64)
+    dot = sums @ sums.T
+    sizes = np.bincount(rows, minlength=len(groups)).astype(np.float64)
+    self_dot = np.bincount(rows, weights=(unit.astype(np.float64) ** 2).sum(axis=1), minlength=len(groups))
+
+    pairs = np.outer(sizes, sizes)
+    np.fill_diagonal(dot, dot.diagonal() - self_dot)
+    np.fill_diagonal(pairs, sizes * (sizes - 1))
+    mean = np.divide(dot, pairs, out=np.full_like(dot, np.nan), where=pairs > 0)
+
+    labels = [f"{model} ({text_type})" for model, text_type in groups]
+    return pd.DataFrame(mean, index=pd.Index(labels, name="Gruppe"), columns=labels)
+
+
+# Alle Textpaare innerhalb desselben Themas (TextID) mit ihrer Kosinus-Ähnlichkeit.
+# Themen gleicher Größe werden gestapelt und mit einem Batch-Matrixprodukt gerechnet.
+# Human-Texte stehen immer auf Seite A.
+def within_topic_pairs(unit, text_ids, models, text_types):
+    text_ids = np.asarray(text_ids)
+    models = np.asarray(models, dtype=object)
+    text_types = np.asarray(text_types, dtype=object)
+
+    order = np.argsort(text_ids, kind="stable")
+    topics, starts, sizes = np.unique(text_ids[order], return_index=True, return_counts=True)
+
+    left, right, similarity = [], [], []
+    for size in np.unique(sizes):
+        if size < 2:
+            continue
+        members = order[starts[sizes == size][:, None] + np.arange(size)]
+        block = np.matmul(unit[members], unit[members].transpose(0, 2, 1))
+        i, j = np.triu_indices(size, k=1)
+        left.append(members[:, i].ravel())
+        right.append(members[:, j].ravel())
+        similarity.append(block[:, i, j].ravel())
+
+    if not left:
+        left = right = np.zeros(0, dtype=np.int64)
+        similarity = np.zeros(0, dtype=np.float32)
+    else:
+        left, right, similarity = np.concatenate(left), np.concatenate(right), np.concatenate(similarity)
+
+    swap = (models[right] == HUMAN_MODEL) & (models[left] != HUMAN_MODEL)
+    left, right = np.where(swap, right, left), np.where(swap, left, right)
+    pair_order = np.lexsort((right, left))
+    left, right, similarity = left[pair_order], right[pair_order], similarity[pair_order]
+
+    return pd.DataFrame({
+        "TextID": text_ids[left],
+        "Model_A": models[left], "TextType_A": text_types[left],
+        "Model_B": models[right], "TextType_B": text_types[right],
+        "Similarity": similarity.astype(np.float32),
+    })
+
+
+def _describe(values, keys):
+    grouped = values.groupby(keys, sort=False)["Similarity"]
+    summary = grouped.agg(["count", "mean", "std", "min", "max"])
+    quantiles = grouped.quantile(QUANTILES).unstack()
+    quantiles.columns = [f"q{int(q * 100):02d}" for q in QUANTILES]
+    return summary.join(quantiles).reset_index()
+
+
+# Verteilungen der Ähnlichkeit innerhalb eines Themas je Modell/Texttyp:
+# zum Human-Text des Themas und zu den übrigen Modelltexten des Themas
+def similarity_distributions(pairs):
+    human = pairs[pairs["Model_A"] == HUMAN_MODEL]
+    human = human.rename(columns={"Model_B": "Model", "TextType_B": "TextType"})
+    human_summary = _describe(human, ["Model", "TextType"])
+    human_summary.insert(0, "Vergleich", "Human–Modell")
+
+    models = pairs[pairs["Model_A"] != HUMAN_MODEL]
+    both_sides = pd.concat([
+        models.rename(columns={"Model_A": "Model", "TextType_A": "TextType"})[["Model", "TextType", "Similarity"]],
+        models.rename(columns={"Model_B": "Model", "TextType_B": "TextType"})[["Model", "TextType", "Similarity"]],
+    ])
+    model_summary = _describe(both_sides, ["Model", "TextType"])
+    model_summary.insert(0, "Vergleich", "Modell–Modell")
+
+    return pd.concat([human_summary, model_summary], ignore_index=True)
+
+
+def write_pairs(pairs, path):
+    feather.write_feather(pairs.reset_index(drop=True), path, compression="uncompressed")
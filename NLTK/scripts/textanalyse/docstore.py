@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import shutil
+
+from spacy.tokens import DocBin
+
+from .corpus import CORPUS_PATH, iter_texts
+from .pipeline import DEFAULT_BATCH_SIZE, DEFAULT_N_PROCESS, pipe_texts
+
+STORE_PATH = "./corpus/texte.spacy"
+
+# Der Store ist ein Ordner mit DocBin-Teilen zu je SHARD_SIZE Docs, damit weder
+# beim Schreiben noch beim Lesen mehr als ein Teil im Speicher liegt
+SHARD_SIZE = 1000
+META_FILE = "meta.json"
+
+# Annotationen, die die Analysen brauchen; is_stop/is_alpha/is_punct kommen
+# als Lexem-Attribute aus dem Vokabular des geladenen Modells
+DOC_ATTRS = ["ORTH", "LEMMA", "POS", "TAG", "MORPH", "SENT_START"]
+
+
+def _file_hash(path):
+    sha = hashlib.sha1()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _model_id(nlp):
+    return f"{nlp.meta.get('lang')}_{nlp.meta.get('name')}-{nlp.meta.get('version')}"
+
+
+def _store_meta(nlp, corpus_path):
+    return {"corpus_sha1": _file_hash(corpus_path), "model": _model_id(nlp), "pipeline": nlp.pipe_names}
+
+
+# Inhaltsschlüssel eines Textes: Hash über Modell/Pipeline-Version und Text.
+# Gleicher Schlüssel -> gleiches Parse-Ergebnis, der Text muss nicht neu geparst werden.
+def doc_key(nlp, text):
+    version = f"{_model_id(nlp)}|{','.join(nlp.pipe_names)}"
+    return hashlib.sha1(f"{version}\n{text}".encode("utf-8")).hexdigest()
+
+
+def _shard_path(store_path, shard):
+    return os.path.join(store_path, f"part-{shard:05d}.spacy")
+
+
+def _read_meta(store_path):
+    meta_path = os.path.join(store_path, META_FILE)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _remove(path):
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+# Liest Docs eines bestehenden Stores über (Teil, Position); immer nur ein Teil im Speicher
+class _ShardReader:
+    def __init__(self, nlp, store_path):
+        self.nlp = nlp
+        self.store_path = store_path
+        self.shard = None
+        self.docs = []
+
+    def get(self, shard, position):
+        if shard != self.shard:
+            doc_bin = DocBin(store_user_data=True).from_disk(_shard_path(self.store_path, shard))
+            self.docs = list(doc_bin.get_docs(self.nlp.vocab))
+            self.shard = shard
+        return self.docs[position]
+
+
+# Wo liegt welcher Text im bestehenden Store? {Inhaltsschlüssel: (Teil, Position)}
+# Nur wenn Modell und Pipeline gleich geblieben sind, sonst muss alles neu geparst werden.
+def _reusable_docs(nlp, store_path):
+    meta = _read_meta(store_path)
+    if meta is None or "docs" not in meta:
+        return {}
+    if meta.get("model") != _model_id(nlp) or meta.get("pipeline") != nlp.pipe_names:
+        return {}
+    shard_size = meta["shard_size"]
+    return {entry[0]: divmod(i, shard_size) for i, entry in enumerate(meta["docs"])}
+
+
+# Parst das Korpus mit nlp.pipe und speichert alle Docs als DocBin-Teile.
+# Texte werden gestreamt; Schlüssel (text_id, Modell, Texttyp) laufen über as_tuples mit.
+# Inkrementell: Texte, deren Inhaltsschlüssel schon im bestehenden Store liegt,
+# werden von dort übernommen – geparst werden nur neue oder geänderte Texte.
+def build_doc_store(nlp, corpus_path=CORPUS_PATH, store_path=STORE_PATH,
+                    n_process=DEFAULT_N_PROCESS, batch_size=DEFAULT_BATCH_SIZE, shard_size=SHARD_SIZE,
+                    incremental=True):
+    reusable = _reusable_docs(nlp, store_path) if incremental else {}
+    entries = [(doc_key(nlp, text), text_id, model, text_type)
+               for text_id, model, text_type, text in iter_texts(corpus_path)]
+    num_parse = sum(1 for key, *_ in entries if key not in reusable)
+
+    print(f"🧠 Parse {num_parse} von {len(entries)} Texten für {store_path} "
+          f"({n_process} Prozess(e), Batchgröße {batch_size}) ...")
+    records = ((text, text_id) for text_id, model, text_type, text in iter_texts(corpus_path)
+               if doc_key(nlp, text) not in reusable)
+    parsed = pipe_texts(nlp, records, as_tuples=True, n_process=n_process, batch_size=batch_size)
+    old_docs = _ShardReader(nlp, store_path)
+
+    # Neuer Store erst in einen temporären Ordner, da der alte währenddessen gelesen wird
+    tmp_path = store_path + ".tmp"
+    _remove(tmp_path)
+    os.makedirs(tmp_path)
+
+    num_shards = 0
+    doc_bin = DocBin(attrs=DOC_ATTRS, store_user_data=True)
+    for key, text_id, model, text_type in entries:
+        if key in reusable:
+            doc = old_docs.get(*reusable[key])
+        else:
+            doc, _ = next(parsed)
+        doc.user_data["key"] = key
+        doc.user_data["text_id"] = text_id
+        doc.user_data["model"] = model
+        doc.user_data["text_type"] = text_type
+        doc_bin.add(doc)
+
+        if len(doc_bin) >= shard_size:
+            doc_bin.to_disk(_shard_path(tmp_path, num_shards))
+            num_shards += 1
+            doc_bin = DocBin(attrs=DOC_ATTRS, store_user_data=True)
+
+    if len(doc_bin):
+        doc_bin.to_disk(_shard_path(tmp_path, num_shards))
+        num_shards += 1
+
+    meta = {**_store_meta(nlp, corpus_path), "num_docs": len(entries), "num_shards": num_shards,
+            "shard_size": shard_size, "docs": entries}
+    with open(os.path.join(tmp_path, META_FILE), "w", encoding="utf-8") as file:
+        json.dump(meta, file)
+
+    _remove(store_path)
+    os.replace(tmp_path, store_path)
+
+    print(f"✅ Doc-Store mit {len(entries)} Texten gespeichert unter: {store_path} "
+          f"({len(entries) - num_parse} übernommen, {num_parse} neu geparst)")
+
+
+def store_is_current(nlp, corpus_path=CORPUS_PATH, store_path=STORE_PATH):
+    meta = _read_meta(store_path)
+    if meta is None or "docs" not in meta:
+        return False
+    return {key: meta.get(key) for key in ("corpus_sha1", "model", "pipeline")} == _store_meta(nlp, corpus_path)
+
+
+# Passt der Store zum Korpus? Ohne Sprachmodell geprüft, nur über den Korpus-Hash
+def store_matches_corpus(corpus_path=CORPUS_PATH, store_path=STORE_PATH):
+    meta = _read_meta(store_path)
+    return meta is not None and "docs" in meta and meta["corpus_sha1"] == _file_hash(corpus_path)
+
+
+# Baut den Doc-Store neu, falls Korpus, Modell oder Pipeline sich geändert haben
+def ensure_doc_store(nlp, corpus_path=CORPUS_PATH, store_path=STORE_PATH,
+                     n_process=DEFAULT_N_PROCESS, batch_size=DEFAULT_BATCH_SIZE):
+    if not store_is_current(nlp, corpus_path, store_path):
+        build_doc_store(nlp, corpus_path, store_path, n_process=n_process, batch_size=batch_size)
+
+
+# Metadaten des Stores (Korpus-Hash, Modell, Pipeline, Texte); None ohne Store
+def doc_store_meta(store_path=STORE_PATH):
+    return _read_meta(store_path)
+
+
+def doc_store_size(store_path=STORE_PATH):
+    return _read_meta(store_path)["num_docs"]
+
+
+# (Inhaltsschlüssel, text_id, Modell, Texttyp) aller Texte in Korpus-Reihenfolge,
+# nur aus meta.json – ohne ein Doc zu laden
+def doc_store_entries(store_path=STORE_PATH):
+    return [tuple(entry) for entry in _read_meta(store_path)["docs"]]
+
+
+# Liest den Doc-Store Teil für Teil
+# Generator über (text_id, Modell, Texttyp, Doc) in Korpus-Reihenfolge
+def iter_doc_store(nlp, store_path=STORE_PATH):
+    meta = _read_meta(store_path)
+    for shard in range(meta["num_shards"]):
+        doc_bin = DocBin(store_user_data=True).from_disk(_shard_path(store_path, shard))
+        for doc in doc_bin.get_docs(nlp.vocab):
+            yield doc.user_data["text_id"], doc.user_data["model"], doc.user_data["text_type"], doc
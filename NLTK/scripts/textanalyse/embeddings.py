@@ -0,0 +1,102 @@
+import json
+import os
+
+import numpy as np
+
+# Dateien eines gespeicherten LemmaVectors-Objekts (siehe save/load)
+MATRIX_FILE = "matrix.npy"
+NORMS_FILE = "norms.npy"
+LEMMAS_FILE = "lemmas.json"
+
+
+# Ein Vektor pro Lemma, einmalig aus nlp.vocab.vectors gelesen.
+# matrix ist zeilenweise L2-normalisiert, norms enthält die ursprünglichen Längen,
+# damit sich sowohl Kosinus-Ähnlichkeiten als auch Rohvektor-Mittelwerte als
+# Matrixoperationen rechnen lassen.
+class LemmaVectors:
+    def __init__(self, lemmas, vectors):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.lemmas = list(lemmas)
+        self.index = {lemma: row for row, lemma in enumerate(self.lemmas)}
+        self.norms = np.linalg.norm(vectors, axis=1).astype(np.float32)
+        safe_norms = np.where(self.norms > 0, self.norms, 1.0)
+        self.matrix = vectors / safe_norms[:, None]
+
+    # Entspricht nlp(lemma).vector / has_vector, aber ohne Pipeline:
+    # nur Tokenizer + Vokabular, und nur einmal pro Lemma
+    @classmethod
+    def from_nlp(cls, nlp, lemmas):
+        vocab = nlp.vocab
+        found_lemmas = []
+        found_vectors = []
+
+        for lemma in sorted(set(lemmas)):
+            keys = [token.orth for token in nlp.make_doc(lemma)]
+            if not keys or not any(vocab.has_vector(key) for key in keys):
+                continue
+            if len(keys) == 1:
+                vector = vocab.get_vector(keys[0])
+            else:
+                vector = np.mean([vocab.get_vector(key) for key in keys], axis=0)
+            found_lemmas.append(lemma)
+            found_vectors.append(vector)
+
+        if not found_vectors:
+            return cls([], np.zeros((0, vocab.vectors_length), dtype=np.float32))
+        return cls(found_lemmas, np.vstack(found_vectors))
+
+    # Aus bereits normalisierter Matrix und Längen, ohne Kopie (z. B. memory-mapped)
+    @classmethod
+    def from_arrays(cls, lemmas, matrix, norms):
+        vectors = cls.__new__(cls)
+        vectors.lemmas = list(lemmas)
+        vectors.index = {lemma: row for row, lemma in enumerate(vectors.lemmas)}
+        vectors.matrix = matrix
+        vectors.norms = norms
+        return vectors
+
+    # Speichert Matrix und Längen als .npy und die Lemmata (Zeile = Position) als JSON
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, MATRIX_FILE), np.ascontiguousarray(self.matrix))
+        np.save(os.path.join(path, NORMS_FILE), np.ascontiguousarray(self.norms))
+        with open(os.path.join(path, LEMMAS_FILE), "w", encoding="utf-8") as file:
+            json.dump(self.lemmas, file, ensure_ascii=False)
+
+    # Lädt ein gespeichertes Objekt; die Matrix wird nur eingeblendet (mmap, nur lesend),
+    # mehrere Prozesse teilen sich dieselben Seiten
+    @classmethod
+    def load(cls, path, mmap_mode="r"):
+        matrix = np.load(os.path.join(path, MATRIX_FILE), mmap_mode=mmap_mode)
+        norms = np.load(os.path.join(path, NORMS_FILE), mmap_mode=mmap_mode)
+        with open(os.path.join(path, LEMMAS_FILE), "r", encoding="utf-8") as file:
+            lemmas = json.load(file)
+        return cls.from_arrays(lemmas, matrix, norms)
+
+    def __len__(self):
+        return len(self.lemmas)
+
+    def __contains__(self, lemma):
+        return lemma in self.index
+
+    @property
+    def dim(self):
+        return self.matrix.shape[1]
+
+    # Zeilennummern der Lemmata mit Vektor (Lemmata ohne Vektor fallen weg)
+    def rows(self, lemmas):
+        index = self.index
+        return np.fromiter((index[lemma] for lemma in lemmas if lemma in index), dtype=np.int64)
+
+    # Mittelwert der Rohvektoren aus gezählten Häufigkeiten {Lemma: Anzahl}
+    def average_vector_counts(self, counts):
+        weights = np.zeros(len(self), dtype=np.float32)
+        total = 0
+        for lemma, freq in counts.items():
+            row = self.index.get(lemma)
+            if row is not None:
+                weights[row] += freq
+                total += freq
+        if total == 0:
+            return np.zeros((self.dim,), dtype=np.float32)
+        return ((weights * self.norms) @ self.matrix) / total
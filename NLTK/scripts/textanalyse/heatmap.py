@@ -0,0 +1,166 @@
+import base64
+import json
+import math
+import warnings
+
+import numpy as np
+from scipy.cluster.hierarchy import leaves_list, linkage
+from scipy.cluster.vq import kmeans2
+
+# Höchstzahl der Spalten, die die Heatmap auf einmal zeichnet; breitere Ausschnitte
+# werden zu Blöcken benachbarter Kategorien gemittelt
+MAX_COLUMNS = 1000
+# Höchstzahl beschrifteter Kategorien auf der x-Achse
+MAX_LABELS = 60
+# Bis zu so vielen Kategorien wird direkt hierarchisch sortiert, darüber erst grob
+# per k-Means gruppiert und dann Gruppen und Kategorien je Gruppe
+LINKAGE_LIMIT = 4000
+
+# Wird nach dem Zeichnen im Browser ausgeführt: die vollständige Matrix liegt als
+# base64-gepacktes Typed Array in der Datei; bei jedem Zoom/Verschieben wird nur
+# der sichtbare Ausschnitt (plus je eine Breite links und rechts) neu gezeichnet,
+# ab MAX_COLUMNS Kategorien als Blockmittel, darunter Kategorie für Kategorie.
+# Hover-Texte und Achsenbeschriftung entstehen erst hier, nur für den Ausschnitt.
+ZOOM_SCRIPT = """
+const gd = document.getElementById('{plot_id}');
+const bytes = Uint8Array.from(atob(__DATA__), c => c.charCodeAt(0));
+const values = new __ARRAY__(bytes.buffer);
+const names = __NAMES__;
+const groups = __GROUPS__;
+const C = names.length, G = groups.length, MAX_COLUMNS = __MAX_COLUMNS__, MAX_LABELS = __MAX_LABELS__;
+
+function render(lo, hi) {
+    const visible = Math.max(hi - lo, 1);
+    const width = Math.ceil(visible / MAX_COLUMNS);
+    let start = Math.max(0, lo - visible);
+    start -= start % width;
+    const end = Math.min(C, hi + visible);
+    const x = [], z = groups.map(() => []), text = groups.map(() => []);
+    for (let first = start; first < end; first += width) {
+        const last = Math.min(first + width, end);
+        const label = last - first > 1 ? `${names[first]} … ${names[last - 1]} (${last - first} Kategorien, Mittel)` : names[first];
+        x.push(first + (last - first - 1) / 2);
+        for (let g = 0; g < G; g++) {
+            let sum = 0;
+            for (let c = first; c < last; c++) sum += values[g * C + c];
+            z[g].push(sum / (last - first));
+            text[g].push(label);
+        }
+    }
+    const step = Math.ceil(visible / MAX_LABELS), tickvals = [], ticktext = [];
+    for (let c = lo - lo % step; c < hi; c += step) { tickvals.push(c); ticktext.push(names[c]); }
+    Plotly.update(gd, {x: [x], z: [z], text: [text]}, {'xaxis.tickvals': tickvals, 'xaxis.ticktext': ticktext}, [0]);
+}
+
+gd.on('plotly_relayout', event => {
+    if (event['xaxis.autorange']) {
+        render(0, C);
+        return;
+    }
+    const range = event['xaxis.range'] || [event['xaxis.range[0]'], event['xaxis.range[1]']];
+    if (range[0] === undefined) return;
+    render(Math.max(0, Math.ceil(range[0] - 0.5)), Math.min(C, Math.floor(range[1] + 0.5) + 1));
+});
+render(0, C);
+"""
+
+_ARRAY_TYPES = {"u1": "Uint8Array", "u2": "Uint16Array", "u4": "Uint32Array", "f4": "Float32Array"}
+
+
+# Reihenfolge, in der ähnliche Zeilen (Kategorien) nebeneinander liegen: Blätter einer
+# Ward-Hierarchie über die Einheitsvektoren. Große Mengen werden erst per k-Means in
+# ~√n Gruppen geteilt, die Gruppen nach ihren Zentren und die Kategorien innerhalb
+# jeder Gruppe hierarchisch sortiert. Zeilen ohne Vektor (Nullvektor) kommen ans Ende.
+def similarity_order(vectors, limit=LINKAGE_LIMIT, seed=0):
+    vectors = np.asarray(vectors, dtype=np.float64)
+    norms = np.linalg.norm(vectors, axis=1)
+    known = np.flatnonzero(norms > 0)
+    unit = vectors[known] / norms[known, None]
+    return np.concatenate([known[_tree_order(unit, limit, seed)], np.flatnonzero(norms == 0)])
+
+
+def _tree_order(points, limit, seed):
+    n = len(points)
+    if n < 3:
+        return np.arange(n)
+    if n <= limit:
+        return leaves_list(linkage(points, method="ward"))
+
+    # Leere Gruppen sind harmlos (fallen unten weg), daher ohne Warnung
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        centroids, labels = kmeans2(points, math.ceil(math.sqrt(n)), minit="points", seed=seed)
+    present = np.unique(labels)
+    if len(present) == 1:
+        return np.arange(n)
+    members = [np.flatnonzero(labels == group) for group in present[_tree_order(centroids[present], limit, seed)]]
+    return np.concatenate([rows[_tree_order(points[rows], limit, seed)] for rows in members])
+
+
+# Summe der Einheitsvektoren aller Lemmata je Kategorie (Richtung des Clusters);
+# ohne Codebook bzw. für Kategorien außerhalb davon nur der Leader (= Kategoriename)
+def category_vectors(names, lemma_vectors, clusters=None):
+    clusters = clusters or {}
+    vectors = np.zeros((len(names), lemma_vectors.dim), dtype=np.float32)
+    for i, name in enumerate(names):
+        rows = lemma_vectors.rows(clusters.get(name, [name]))
+        if rows.size:
+            vectors[i] = lemma_vectors.matrix[rows].sum(axis=0)
+    return vectors
+
+
+# Blockmittel über je width benachbarte Spalten (letzter Block ggf. schmaler):
+# (Mitte jedes Blocks in Spaltenkoordinaten, Gruppen × Blöcke)
+def downsample(values, width):
+    starts = np.arange(0, values.shape[1], width)
+    sizes = np.diff(np.append(starts, values.shape[1]))
+    return starts + (sizes - 1) / 2, np.add.reduceat(values, starts, axis=1) / sizes
+
+
+# Kleinster Datentyp, der alle Zählungen exakt hält (ganzzahlig: u1/u2/u4, sonst f4)
+def packed_dtype(values):
+    if values.size and np.all(values >= 0) and np.all(values == np.round(values)):
+        for dtype in ("<u1", "<u2", "<u4"):
+            if values.max() <= np.iinfo(dtype).max:
+                return np.dtype(dtype)
+    return np.dtype("<f4")
+
+
+# Heatmap Gruppen × Kategorien für große Kategoriemengen: die erste Ansicht ist auf
+# max_columns Blöcke verkleinert (Plotly legt die Arrays binär ab), die volle Matrix
+# wird einmal gepackt eingebettet und beim Zoomen im Browser ausgeschnitten (ZOOM_SCRIPT)
+def write_heatmap(path, groups, names, values, max_columns=MAX_COLUMNS, title=None, include_plotlyjs=True):
+    import plotly.graph_objects as go
+
+    values = np.asarray(values)
+    dtype = packed_dtype(values)
+    x, overview = downsample(values.astype(np.float32), max(1, math.ceil(values.shape[1] / max_columns)))
+
+    fig = go.Figure(data=go.Heatmap(
+        z=overview.astype(np.float32),
+        x=x,
+        y=list(groups),
+        zmin=0,
+        zmax=float(values.max()) if values.size else 1.0,
+        colorscale="YlOrRd",
+        colorbar=dict(title="Frequency"),
+        hovertemplate="%{text}<br>%{y}<br>%{z:.1f}<extra></extra>",
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis_title="Kategorie",
+        yaxis_title="Modell – Texttyp",
+        xaxis_tickangle=-45,
+        xaxis_tickmode="array",
+        yaxis_fixedrange=True,
+        height=700,
+    )
+
+    script = (ZOOM_SCRIPT
+              .replace("__DATA__", json.dumps(base64.b64encode(values.astype(dtype).tobytes()).decode("ascii")))
+              .replace("__ARRAY__", _ARRAY_TYPES[dtype.str[1:]])
+              .replace("__NAMES__", json.dumps(list(names), ensure_ascii=False))
+              .replace("__GROUPS__", json.dumps(list(groups), ensure_ascii=False))
+              .replace("__MAX_COLUMNS__", str(max_columns))
+              .replace("__MAX_LABELS__", str(MAX_LABELS)))
+    fig.write_html(path, include_plotlyjs=include_plotlyjs, post_script=script)
@@ -0,0 +1,262 @@
+import json
+from collections import defaultdict
+
+import numpy as np
+from scipy import sparse
+
+from .embeddings import LemmaVectors
+
+# Kategorien eines clustering.py-Laufs (Leader und Lemmata, in Anlege-Reihenfolge)
+CODEBOOK_FILE = "kategorien.json"
+
+
+# Globale Kategorien nach dem Leader-Verfahren aus clustering.py:
+# Lemmata in sortierter Reihenfolge; ein Lemma kommt zur ähnlichsten bestehenden
+# Kategorie (bei Gleichstand gewinnt die ältere), wenn die Ähnlichkeit den
+# Schwellenwert erreicht, sonst eröffnet es eine neue Kategorie.
+#
+# Statt jede Kategorie einzeln zu vergleichen, wird ein Block von Lemmata mit
+# einem Matrixprodukt gegen alle bisherigen Leader bewertet; nur die Leader,
+# die innerhalb des Blocks neu entstehen, werden pro Lemma nachgerechnet.
+# Die Leader-Matrix wächst blockweise (Verdopplung), ohne pro Lemma zu kopieren.
+# counters (optional, z. B. RunMetrics.counters) zählt die Ähnlichkeitsberechnungen.
+def build_global_categories(lemmas, lemma_vectors, similarity_threshold=0.7, block_size=256, counters=None):
+    ordered = [lemma for lemma in sorted(lemmas) if lemma in lemma_vectors]
+    clusters = defaultdict(list)
+
+    leaders = np.empty((block_size, lemma_vectors.dim), dtype=lemma_vectors.matrix.dtype)
+    leader_names = []
+
+    for start in range(0, len(ordered), block_size):
+        block = ordered[start:start + block_size]
+        block_vecs = lemma_vectors.matrix[lemma_vectors.rows(block)]
+
+        n_old = len(leader_names)
+        evaluations = len(block) * n_old
+        if n_old:
+            old_sims = block_vecs @ leaders[:n_old].T
+            old_best = old_sims.argmax(axis=1)
+            old_score = old_sims[np.arange(len(block)), old_best]
+
+        for i, lemma in enumerate(block):
+            best = -1
+            best_score = 0.0
+            if n_old:
+                best = int(old_best[i])
+                best_score = float(old_score[i])
+
+            n = len(leader_names)
+            if n > n_old:
+                evaluations += n - n_old
+                new_sims = leaders[n_old:n] @ block_vecs[i]
+                j = int(new_sims.argmax())
+                if best < 0 or new_sims[j] > best_score:
+                    best = n_old + j
+                    best_score = float(new_sims[j])
+
+            if best >= 0 and best_score > 0.0 and best_score >= similarity_threshold:
+                clusters[leader_names[best]].append(lemma)
+                continue
+
+            if n == len(leaders):
+                leaders = np.concatenate([leaders, np.empty_like(leaders)])
+            leaders[n] = block_vecs[i]
+            leader_names.append(lemma)
+            clusters[lemma].append(lemma)
+
+        if counters is not None:
+            counters["similarity_evaluations"] += evaluations
+
+    return clusters
+
+
+# Beste Kategorie pro Lemma, einmal global berechnet: ein Matrixprodukt
+# Lemma-Vektoren × Kategorie-Vektoren (blockweise), dann argmax pro Zeile.
+# table[row] ist der Kategorie-Index zur Zeile in lemma_vectors, -1 = keine
+# Kategorie (kein Vektor oder keine positive Ähnlichkeit). Bei Gleichstand
+# gewinnt wie in der Schleife die zuerst angelegte Kategorie.
+class CategoryLookup:
+    def __init__(self, clusters, lemma_vectors, lemmas=None, block_size=4096):
+        self.lemma_vectors = lemma_vectors
+        self.names = [category for category in clusters if category in lemma_vectors]
+        category_matrix = lemma_vectors.matrix[lemma_vectors.rows(self.names)]
+
+        if lemmas is None:
+            rows = np.arange(len(lemma_vectors))
+        else:
+            rows = np.unique(lemma_vectors.rows(lemmas))
+
+        self.table = np.full(len(lemma_vectors), -1, dtype=np.int32)
+        if not self.names:
+            return
+
+        for start in range(0, len(rows), block_size):
+            block_rows = rows[start:start + block_size]
+            sims = lemma_vectors.matrix[block_rows] @ category_matrix.T
+            best = sims.argmax(axis=1)
+            best_score = sims[np.arange(len(block_rows)), best]
+            self.table[block_rows] = np.where(best_score > 0.0, best, -1)
+
+    # Zuordnung aus einer bereits berechneten Tabelle (z. B. SimilarityGraph)
+    @classmethod
+    def from_table(cls, names, lemma_vectors, table):
+        lookup = cls.__new__(cls)
+        lookup.lemma_vectors = lemma_vectors
+        lookup.names = list(names)
+        lookup.table = table
+        return lookup
+
+    # Kategorie-Indizes aller Vorkommen (Lemmata ohne Kategorie fallen weg)
+    def category_ids(self, lemmas):
+        ids = self.table[self.lemma_vectors.rows(lemmas)]
+        return ids[ids >= 0]
+
+    # Lemma×Kategorie-Indikatormatrix (Zeilen wie lemma_vectors): macht aus
+    # Lemma-Häufigkeiten mit einem Matrixprodukt Kategorie-Häufigkeiten
+    def mapping_matrix(self):
+        rows = np.flatnonzero(self.table >= 0)
+        return sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int64), (rows, self.table[rows])),
+            shape=(len(self.table), len(self.names)),
+        )
+
+    # Kategorie-Indizes in der Reihenfolge ihres ersten Vorkommens, aus der
+    # Reihenfolge des ersten Vorkommens der Lemmata (Zeilen in lemma_vectors)
+    def category_order(self, lemma_order):
+        ids = self.table[lemma_order]
+        ids = ids[ids >= 0]
+        _, first = np.unique(ids, return_index=True)
+        return ids[np.sort(first)]
+
+
+# Dünnbesetzter Ähnlichkeitsgraph der Lemmata für mehrere Schwellenwerte:
+# einmal blockweise alle Paare mit Ähnlichkeit >= min_threshold, danach für jeden
+# Schwellenwert >= min_threshold dieselben Kategorien wie build_global_categories
+# und dieselbe Zuordnung wie CategoryLookup, ohne die Vektoren erneut zu vergleichen.
+# Knoten sind die Lemmata in sortierter Reihenfolge (= Reihenfolge des Leader-Verfahrens).
+class SimilarityGraph:
+    def __init__(self, lemmas, lemma_vectors, min_threshold, block_size=1024):
+        if min_threshold <= 0:
+            raise ValueError("min_threshold muss größer als 0 sein")
+        self.lemma_vectors = lemma_vectors
+        self.min_threshold = min_threshold
+        self.lemmas = [lemma for lemma in sorted(lemmas) if lemma in lemma_vectors]
+        self.rows = lemma_vectors.rows(self.lemmas)
+        vectors = lemma_vectors.matrix[self.rows]
+
+        blocks = []
+        for start in range(0, len(self.lemmas), block_size):
+            sims = vectors[start:start + block_size] @ vectors.T
+            sims[sims < min_threshold] = 0
+            blocks.append(sparse.csr_matrix(sims))
+        n = len(self.lemmas)
+        self.graph = sparse.vstack(blocks, format="csr") if blocks else sparse.csr_matrix((n, n), dtype=vectors.dtype)
+        self.graph.sort_indices()
+
+    @property
+    def num_edges(self):
+        return self.graph.nnz
+
+    # Leader-Verfahren auf dem Graphen: ein Lemma kommt zum ähnlichsten bisherigen
+    # Leader unter seinen Nachbarn mit Ähnlichkeit >= threshold (Gleichstand: älterer
+    # Leader = kleinerer Index), sonst wird es selbst Leader. Gibt die Kategorien
+    # wie build_global_categories und die Leader-Indizes zurück.
+    def leaders(self, threshold):
+        if threshold < self.min_threshold:
+            raise ValueError(f"Schwellenwert {threshold} liegt unter {self.min_threshold}")
+        indptr, indices, data = self.graph.indptr, self.graph.indices, self.graph.data
+        is_leader = np.zeros(len(self.lemmas), dtype=bool)
+        clusters = defaultdict(list)
+        leader_ids = []
+
+        for i, lemma in enumerate(self.lemmas):
+            neighbours = indices[indptr[i]:indptr[i + 1]]
+            sims = data[indptr[i]:indptr[i + 1]]
+            candidates = is_leader[neighbours] & (sims >= threshold)
+            if candidates.any():
+                scores = np.where(candidates, sims, -1.0)
+                clusters[self.lemmas[neighbours[scores.argmax()]]].append(lemma)
+                continue
+            is_leader[i] = True
+            leader_ids.append(i)
+            clusters[lemma].append(lemma)
+
+        return clusters, np.asarray(leader_ids, dtype=np.int64)
+
+    # Kategorien und Zuordnung für einen Schwellenwert. Die ähnlichste Kategorie
+    # jedes Lemmas erreicht immer den Schwellenwert (es ist selbst Leader oder
+    # einem Leader zugeordnet) und ist daher im Graphen enthalten.
+    def categorise(self, threshold):
+        clusters, leader_ids = self.leaders(threshold)
+        to_leader = sparse.csr_matrix(
+            (np.ones(len(leader_ids), dtype=self.graph.dtype), (leader_ids, np.arange(len(leader_ids)))),
+            shape=(len(self.lemmas), len(leader_ids)),
+        )
+        leader_sims = (self.graph @ to_leader).tocsr()
+        leader_sims.sort_indices()
+        best = np.asarray(leader_sims.argmax(axis=1)).ravel()
+        has_leader = np.diff(leader_sims.indptr) > 0
+
+        table = np.full(len(self.lemma_vectors), -1, dtype=np.int32)
+        table[self.rows[has_leader]] = best[has_leader]
+        return clusters, CategoryLookup.from_table([self.lemmas[i] for i in leader_ids], self.lemma_vectors, table)
+
+
+# Speichert die Kategorien samt Wortarten des Laufs als JSON
+def write_codebook(clusters, pos, path):
+    codebook = {"pos": list(pos), "categories": [{"name": name, "lemmas": lemmas} for name, lemmas in clusters.items()]}
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(codebook, file, ensure_ascii=False)
+
+
+# (Wortarten, {Kategorie: Lemmata}) aus write_codebook
+def read_codebook(path):
+    with open(path, "r", encoding="utf-8") as file:
+        codebook = json.load(file)
+    return codebook["pos"], {category["name"]: category["lemmas"] for category in codebook["categories"]}
+
+
+# Kategorien für beliebige, auch neue Lemmata (z. B. Texte außerhalb des Korpus).
+# Die Leader-Vektoren werden einmal geladen; jedes Lemma kommt wie in CategoryLookup
+# zur ähnlichsten Kategorie (Ähnlichkeit > 0, bei Gleichstand die ältere).
+# Die Entscheidung wird je Lemma gemerkt, neue Lemmata eines Aufrufs werden
+# gemeinsam mit einem Matrixprodukt zugeordnet.
+class CategoryCodebook:
+    def __init__(self, nlp, clusters, pos=None):
+        self.nlp = nlp
+        self.pos = pos
+        leader_vectors = LemmaVectors.from_nlp(nlp, clusters)
+        self.names = [category for category in clusters if category in leader_vectors]
+        self.matrix = leader_vectors.matrix[leader_vectors.rows(self.names)]
+        self.memo = {}
+
+    @classmethod
+    def from_file(cls, nlp, path):
+        pos, clusters = read_codebook(path)
+        return cls(nlp, clusters, pos)
+
+    def _assign_new(self, lemmas):
+        new = sorted({lemma for lemma in lemmas if lemma not in self.memo})
+        if not new:
+            return
+        vectors = LemmaVectors.from_nlp(self.nlp, new)
+        for lemma in new:
+            self.memo[lemma] = -1
+        if len(vectors) and self.names:
+            sims = vectors.matrix @ self.matrix.T
+            best = sims.argmax(axis=1)
+            best_score = sims[np.arange(len(vectors)), best]
+            for lemma, category, score in zip(vectors.lemmas, best.tolist(), best_score.tolist()):
+                if score > 0.0:
+                    self.memo[lemma] = category
+
+    # Kategorie-Indizes aller Vorkommen (Lemmata ohne Kategorie fallen weg)
+    def category_ids(self, lemmas):
+        self._assign_new(lemmas)
+        ids = np.fromiter((self.memo[lemma] for lemma in lemmas), dtype=np.int64, count=len(lemmas))
+        return ids[ids >= 0]
+
+    # Häufigkeit pro Kategorie als Vektor über alle Kategorien
+    def count_vector(self, lemmas):
+        return np.bincount(self.category_ids(lemmas), minlength=len(self.names))
+
@@ -0,0 +1,51 @@
+import re
+
+# Tokens, die keine Lemmata sind (Seitenangaben, Nummerierungen, Abkürzungen ...),
+# als eine vorkompilierte Regex; jedes Muster gilt wie bei re.match ab Tokenanfang
+EXCLUDE_PATTERNS = [
+    r"^\d+[a-zA-Z]$",
+    r"^\d{2,4}ff$",
+    r"^\d{2,4}–\d{2,4}$",
+    r"^\(\d+\)$",
+    r"^\d+\.\)$",
+    r"^\(\d+[a-zA-Z]?\)$",
+    r"(?i:^(vgl|al)\.$)",
+    r"(?i:^\(i{1,3}v?|v?i{0,3}\)$)",
+    r"^\d+(\.\d+)*\.$",
+]
+EXCLUDE_REGEX = re.compile("|".join(f"(?:{pattern})" for pattern in EXCLUDE_PATTERNS))
+
+
+# Lemma-Filter für main.py und clustering.py.
+# Die Entscheidung hängt nur von der Oberflächenform (Lexem: Satzzeichen, Ziffer,
+# Stoppwort, Vektor, Muster) und der Wortart ab; sie wird je (orth-ID, POS)
+# einmal berechnet und danach nur noch nachgeschlagen.
+#   pos:            erlaubte Wortarten (None = alle)
+#   alpha_only:     nur alphabetische Tokens
+#   require_vector: nur Tokens mit Wortvektor
+class LemmaFilter:
+    def __init__(self, pos=None, alpha_only=False, require_vector=False):
+        self.pos = None if pos is None else set(pos)
+        self.alpha_only = alpha_only
+        self.require_vector = require_vector
+        self.table = {}
+
+    def _decide(self, token):
+        return (
+            (self.pos is None or token.pos_ in self.pos)
+            and not token.is_punct and not token.is_digit and not token.is_stop
+            and (not self.alpha_only or token.is_alpha)
+            and (not self.require_vector or token.has_vector)
+            and not EXCLUDE_REGEX.match(token.text)
+        )
+
+    def __call__(self, token):
+        key = (token.orth, token.pos)
+        keep = self.table.get(key)
+        if keep is None:
+            keep = self.table[key] = self._decide(token)
+        return keep
+
+    # Kleingeschriebene Lemmata aller behaltenen Tokens eines Docs
+    def lemmas(self, doc):
+        return [token.lemma_.lower() for token in doc if self(token)]
@@ -0,0 +1,141 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pyarrow import feather
+from scipy import sparse
+
+from .countmatrix import CountMatrix
+
+GROUP_COLUMNS = ["Model", "TextType"]
+COUNT_COLUMN = "Häufigkeit"
+# Schema-Metadaten mit allen Gruppen, auch solchen ohne einzige Zählung
+GROUPS_KEY = b"groups"
+
+
+# Vollständige Gruppe×Merkmal-Zählmatrix (Modell/Texttyp × Kategorie bzw. Lemma)
+# als Arrow-IPC-Datei (Feather v2, unkomprimiert -> memory-mappable).
+# Gespeichert wird im Langformat ohne Nullen; Modell, Texttyp und Merkmal sind
+# dictionary-kodiert. Zeilen stehen in Gruppen-Reihenfolge, die Merkmal-Kategorien
+# in der Spaltenreihenfolge der Eingabe, damit read_count_matrix sie wiederherstellt.
+# Die vollständige Gruppenliste steht in den Schema-Metadaten, damit Gruppen
+# ohne Zählungen beim Lesen als Nullzeilen erhalten bleiben.
+def write_count_table(long_df, path, feature, groups=None, features=None):
+    long_df = long_df[GROUP_COLUMNS + [feature, COUNT_COLUMN]]
+    long_df = long_df[long_df[COUNT_COLUMN] > 0].copy()
+
+    row_groups = pd.MultiIndex.from_frame(long_df[GROUP_COLUMNS])
+    if groups is None:
+        groups = row_groups.unique()
+    group_codes = pd.Index(groups).get_indexer(row_groups)
+
+    for column in GROUP_COLUMNS:
+        long_df[column] = pd.Categorical(long_df[column], categories=pd.unique(long_df[column]))
+    if features is None:
+        features = pd.unique(long_df[feature])
+    else:
+        features = [f for f, used in zip(features, pd.Index(features).isin(long_df[feature])) if used]
+    long_df[feature] = pd.Categorical(long_df[feature], categories=features)
+    long_df[COUNT_COLUMN] = long_df[COUNT_COLUMN].astype("int64")
+
+    order = pd.DataFrame({"group": group_codes, "feature": long_df[feature].cat.codes.to_numpy()})
+    long_df = long_df.iloc[order.sort_values(["group", "feature"], kind="stable").index]
+
+    table = pa.Table.from_pandas(long_df.reset_index(drop=True), preserve_index=False)
+    group_list = json.dumps([[str(model), str(text_type)] for model, text_type in groups], ensure_ascii=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), GROUPS_KEY: group_list.encode("utf-8")})
+    feather.write_feather(table, path, compression="uncompressed")
+
+
+# Dünnbesetzte Gruppe×Merkmal-Matrix (CSR, Spalten = Merkmal-IDs) speichern.
+# groups: (Model, TextType) je Zeile; features: Name je Merkmal-ID;
+# feature_order: Spaltenreihenfolge der Ausgabe (Standard: alle IDs aufsteigend)
+def write_sparse_matrix(groups, features, matrix, path, feature, feature_order=None):
+    matrix = sparse.csr_matrix(matrix)
+    if feature_order is None:
+        feature_order = np.arange(matrix.shape[1])
+    matrix = matrix[:, feature_order].tocoo()
+    names = np.asarray(features, dtype=object)[feature_order]
+
+    models, text_types = (np.asarray(col, dtype=object) for col in zip(*groups)) if groups else ([], [])
+    long_df = pd.DataFrame({
+        GROUP_COLUMNS[0]: models[matrix.row],
+        GROUP_COLUMNS[1]: text_types[matrix.row],
+        feature: names[matrix.col],
+        COUNT_COLUMN: matrix.data,
+    })
+    write_count_table(long_df, path, feature, pd.MultiIndex.from_tuples(groups, names=GROUP_COLUMNS), list(names))
+
+
+def read_count_table(path):
+    return _read_with_groups(path)[0]
+
+
+# (Langformat, alle Gruppen); ältere Dateien ohne Gruppenliste in den Metadaten:
+# Gruppen in der Reihenfolge ihrer Zeilen
+def _read_with_groups(path):
+    table = feather.read_table(path, memory_map=True)
+    long_df = table.to_pandas()
+    group_list = (table.schema.metadata or {}).get(GROUPS_KEY)
+    if group_list is None:
+        groups = pd.MultiIndex.from_frame(long_df[GROUP_COLUMNS].astype(str)).unique()
+    else:
+        groups = pd.MultiIndex.from_tuples([tuple(group) for group in json.loads(group_list)], names=GROUP_COLUMNS)
+    return long_df, groups
+
+
+# Liest die Matrix wieder in der breiten Form wie kategorie_vergleich.xlsx
+# (Model, TextType, dann alle Merkmale; fehlende Kombinationen = 0)
+def read_count_matrix(path):
+    long_df, groups = _read_with_groups(path)
+    feature = [col for col in long_df.columns if col not in GROUP_COLUMNS + [COUNT_COLUMN]][0]
+
+    features = list(long_df[feature].cat.categories)
+
+    wide = long_df.astype({col: str for col in GROUP_COLUMNS + [feature]}).pivot(
+        index=GROUP_COLUMNS, columns=feature, values=COUNT_COLUMN
+    )
+    wide = wide.reindex(index=groups, columns=features).fillna(0).astype("int64")
+    wide.columns.name = None
+    return wide.reset_index()
+
+
+# Liest die Matrix dünnbesetzt: (Gruppen, Merkmale, CSR-Matrix Gruppen × Merkmale),
+# ohne den Umweg über eine dichte breite Tabelle
+def read_sparse_matrix(path):
+    long_df, groups = _read_with_groups(path)
+    feature = [col for col in long_df.columns if col not in GROUP_COLUMNS + [COUNT_COLUMN]][0]
+
+    row_groups = pd.MultiIndex.from_frame(long_df[GROUP_COLUMNS].astype(str))
+    features = list(long_df[feature].cat.categories)
+
+    matrix = sparse.csr_matrix(
+        (long_df[COUNT_COLUMN].to_numpy(), (groups.get_indexer(row_groups), long_df[feature].cat.codes.to_numpy())),
+        shape=(len(groups), len(features)),
+    )
+    return list(groups), features, matrix
+
+
+# Dokument×Merkmal-Zählmatrix (CSR) mit Modell und Texttyp je Dokument und den
+# Merkmalsnamen als unkomprimierte .npz (nur Zahlen- und Text-Arrays, ohne Pickle).
+# feature_order wie bei write_sparse_matrix
+def write_document_matrix(models, text_types, features, matrix, path, feature_order=None):
+    matrix = sparse.csr_matrix(matrix)
+    if feature_order is None:
+        feature_order = np.arange(matrix.shape[1])
+    matrix = matrix[:, feature_order].tocsr()
+    np.savez(
+        path,
+        data=matrix.data.astype(np.int64), indices=matrix.indices, indptr=matrix.indptr, shape=np.asarray(matrix.shape),
+        models=np.asarray(models, dtype=str), text_types=np.asarray(text_types, dtype=str),
+        features=np.asarray(features, dtype=str)[feature_order],
+    )
+
+
+# Liest die Matrix als (CountMatrix, Merkmalsnamen)
+def read_document_matrix(path):
+    with np.load(path) as arrays:
+        matrix = sparse.csr_matrix((arrays["data"], arrays["indices"], arrays["indptr"]), shape=tuple(arrays["shape"]))
+        counts = CountMatrix(matrix, arrays["models"].astype(object), arrays["text_types"].astype(object))
+        return counts, arrays["features"].tolist()
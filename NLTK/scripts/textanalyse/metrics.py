@@ -0,0 +1,119 @@
+import cProfile
+import io
+import json
+import pstats
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+# resource gibt es nur auf Unix-Systemen; ohne bleibt max_rss_mb weg
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Anzahl Funktionen (nach kumulierter Zeit) im Profil der Metrik-Datei
+PROFILE_TOP = 30
+
+
+# Spitzen-Arbeitsspeicher (RSS) des Prozesses in MB, None wenn nicht messbar.
+# ru_maxrss ist auf macOS in Bytes, auf Linux und den BSDs in Kilobytes angegeben.
+def max_rss_mb():
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(max_rss / (2**20 if sys.platform == "darwin" else 2**10), 2)
+
+
+# Laufzeit-Metriken eines Skriptlaufs: Zeit je Stufe, Zähler (Texte, Tokens,
+# Lemmata, Kategorien, Ähnlichkeitsberechnungen ...) und auf Wunsch ein
+# cProfile-Profil bzw. der Spitzen-Speicher je Stufe (tracemalloc).
+# write() legt alles als JSON neben die Ausgaben.
+class RunMetrics:
+    def __init__(self, run, profile=False, trace_memory=False):
+        self.run = run
+        self.trace_memory = trace_memory
+        self.stages = []
+        self.counters = Counter()
+        self.started = time.time()
+        self._start = time.perf_counter()
+
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.profiler = cProfile.Profile() if profile else None
+        if self.profiler:
+            self.profiler.enable()
+
+    # Misst eine Stufe; in record lassen sich weitere Angaben ablegen
+    # (record["items"] ergibt zusammen mit unit den Durchsatz)
+    @contextmanager
+    def stage(self, name, unit=None):
+        record = {"stage": name}
+        if unit:
+            record["unit"] = unit
+            record["items"] = 0
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            wall = time.perf_counter() - start
+            record["wall_s"] = round(wall, 4)
+            if unit:
+                record["throughput"] = round(record["items"] / wall, 2) if wall > 0 else None
+            if self.trace_memory:
+                record["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+            max_rss = max_rss_mb()
+            if max_rss is not None:
+                record["max_rss_mb"] = max_rss
+            self.stages.append(record)
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def _profile_summary(self):
+        self.profiler.disable()
+        stats = pstats.Stats(self.profiler, stream=io.StringIO()).sort_stats("cumulative")
+        rows = []
+        for (filename, line, function), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            rows.append({"function": f"{filename}:{line}({function})", "calls": calls,
+                         "tottime_s": round(tottime, 4), "cumtime_s": round(cumtime, 4)})
+        return sorted(rows, key=lambda row: row["cumtime_s"], reverse=True)[:PROFILE_TOP]
+
+    def to_dict(self):
+        result = {
+            "run": self.run,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "total_wall_s": round(time.perf_counter() - self._start, 4),
+        }
+        max_rss = max_rss_mb()
+        if max_rss is not None:
+            result["max_rss_mb"] = max_rss
+        result["counters"] = dict(self.counters)
+        result["stages"] = self.stages
+        if self.profiler:
+            result["profile"] = self._profile_summary()
+        return result
+
+    # Schreibt die Metriken als JSON; mit Profil zusätzlich die vollständigen
+    # cProfile-Daten (<path ohne .json>.prof, z. B. für snakeviz)
+    def write(self, path):
+        result = self.to_dict()
+        if self.profiler:
+            self.profiler.dump_stats(path.rsplit(".", 1)[0] + ".prof")
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2, ensure_ascii=False)
+        print(f"📈 Metriken gespeichert in: {path}")
+        return result
+
+
+# Gemeinsame Kommandozeilen-Optionen für die Instrumentierung
+def add_metrics_arguments(parser):
+    parser.add_argument("--profile", action="store_true",
+                        help="Lauf mit cProfile profilieren (Top-Funktionen in der Metrik-Datei, .prof daneben)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Spitzen-Speicher je Stufe mit tracemalloc messen (langsamer)")
+    return parser
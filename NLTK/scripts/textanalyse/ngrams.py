@@ -0,0 +1,123 @@
+import heapq
+from collections import Counter
+from operator import itemgetter
+
+import numpy as np
+
+# Bits pro Token-ID in einem gepackten n-Gramm-Schlüssel (bis zu ~2 Mio. verschiedene Tokens).
+# Ein n-Gramm ist ein einziger int: (id_1 << (n-1)*ID_BITS) | ... | id_n
+ID_BITS = 21
+ID_MASK = (1 << ID_BITS) - 1
+
+# Bis zu dieser Länge passen die Schlüssel in int64, darüber werden Python-ints gerechnet
+MAX_INT64_ORDER = 63 // ID_BITS
+
+
+# n-Gramm-Ordnungen 2..max_n
+def ngram_orders(max_n, min_n=2):
+    return tuple(range(min_n, max_n + 1))
+
+
+def _pack(ids):
+    keys = ids[:, 0].astype(np.int64 if ids.shape[1] <= MAX_INT64_ORDER else object)
+    for j in range(1, ids.shape[1]):
+        keys = (keys << ID_BITS) | ids[:, j].astype(keys.dtype)
+    return keys
+
+
+def _unpack(keys, n):
+    keys = np.asarray(keys, dtype=np.int64 if n <= MAX_INT64_ORDER else object)
+    ids = np.empty((len(keys), n), dtype=np.int64)
+    for j in range(n - 1, -1, -1):
+        ids[:, j] = keys & ID_MASK
+        keys = keys >> ID_BITS
+    return ids
+
+
+def _pack_one(ids):
+    key = 0
+    for token_id in ids:
+        key = (key << ID_BITS) | token_id
+    return key
+
+
+# n-Gramm-Häufigkeiten als zusammenführbares Aggregat.
+# Tokens werden einmal auf Integer-IDs abgebildet (eigenes Vokabular je Aggregat),
+# alle Ordnungen entstehen in einem Durchlauf als gepackte int-Schlüssel:
+# die n-Gramme einer Länge ergeben sich aus denen der vorigen Länge plus nächstem Token.
+# Neben den Zählungen merkt sich jedes Aggregat die ersten und letzten
+# (max_n - 1) Tokens, damit beim Zusammenführen auch die n-Gramme über die
+# Textgrenze hinweg gezählt werden – das Ergebnis ist dasselbe wie für den
+# zusammengefügten Text, einschließlich der Reihenfolge des ersten Vorkommens.
+class NgramCounts:
+    def __init__(self, orders):
+        self.orders = tuple(orders)
+        self.vocab = []
+        self.index = {}
+        self.counts = {n: Counter() for n in self.orders}
+        self.head = []
+        self.tail = []
+        self.length = 0
+
+    @property
+    def context(self):
+        return max(self.orders) - 1
+
+    def _token_id(self, token):
+        token_id = self.index.get(token)
+        if token_id is None:
+            token_id = len(self.vocab)
+            if token_id > ID_MASK:
+                raise ValueError(f"Mehr als {ID_MASK + 1} verschiedene Tokens für gepackte n-Gramm-Schlüssel")
+            self.index[token] = token_id
+            self.vocab.append(token)
+        return token_id
+
+    @classmethod
+    def from_tokens(cls, tokens, orders):
+        agg = cls(orders)
+        ids = np.fromiter((agg._token_id(token) for token in tokens), dtype=np.int64, count=len(tokens))
+
+        keys = ids
+        for n in range(2, max(agg.orders) + 1):
+            if n == MAX_INT64_ORDER + 1:
+                keys = keys.astype(object)
+            keys = (keys[:-1] << ID_BITS) | ids[n - 1:].astype(keys.dtype)
+            if n in agg.counts:
+                agg.counts[n] = Counter(keys.tolist())
+
+        agg.head = ids[:agg.context].tolist()
+        agg.tail = ids[-agg.context:].tolist() if agg.context else []
+        agg.length = len(ids)
+        return agg
+
+    # Hängt other (den nachfolgenden Text) an; dessen Token-IDs werden ins eigene Vokabular übertragen
+    def merge(self, other):
+        remap = np.fromiter((self._token_id(token) for token in other.vocab), dtype=np.int64, count=len(other.vocab))
+        identity = np.array_equal(remap, np.arange(len(remap)))
+
+        boundary = self.tail + remap[other.head].tolist()
+        cut = len(self.tail)
+        for n in self.orders:
+            # nur Fenster, die im linken Teil beginnen und in den rechten reichen
+            self.counts[n].update(
+                _pack_one(boundary[i:i + n]) for i in range(cut) if i + n > cut and i + n <= len(boundary)
+            )
+            theirs = other.counts[n]
+            if theirs and not identity:
+                keys = _pack(remap[_unpack(list(theirs), n)])
+                theirs = dict(zip(keys.tolist(), theirs.values()))
+            self.counts[n].update(theirs)
+
+        if self.length < self.context:
+            self.head = (self.head + remap[other.head].tolist())[:self.context]
+        self.tail = (self.tail + remap[other.tail].tolist())[-self.context:] if self.context else []
+        self.length += other.length
+        return self
+
+    # Die top_k häufigsten n-Gramme als (Token-Tupel, Häufigkeit), per Heap ausgewählt;
+    # bei Gleichstand zählt das erste Vorkommen (wie Counter.most_common)
+    def most_common(self, n, top_k):
+        top = heapq.nlargest(top_k, self.counts[n].items(), key=itemgetter(1))
+        ids = _unpack([key for key, _ in top], n)
+        return [(tuple(self.vocab[i] for i in row), freq) for row, (_, freq) in zip(ids.tolist(), top)]
@@ -0,0 +1,39 @@
+MODEL_NAME = "de_core_news_lg"
+
+# Die Analysen brauchen nur Lemma, POS, Morphologie und Satzgrenzen.
+# Parser und NER werden gar nicht erst geladen.
+EXCLUDED_COMPONENTS = ["parser", "ner"]
+
+DEFAULT_N_PROCESS = 1
+DEFAULT_BATCH_SIZE = 32
+
+
+# Lade spaCy-Modell ohne unnötige Komponenten (spaCy wird erst hier importiert,
+# damit die Kommandozeilen-Optionen ohne spaCy verfügbar sind)
+def load_nlp(model_name=MODEL_NAME, exclude=EXCLUDED_COMPONENTS):
+    import spacy
+
+    nlp = spacy.load(model_name, exclude=exclude)
+    # Ohne Parser übernimmt der (standardmäßig deaktivierte) senter die Satzgrenzen
+    if "senter" in nlp.disabled:
+        nlp.enable_pipe("senter")
+    return nlp
+
+
+# nlp.pipe über mehrere Texte, auf mehrere Prozesse verteilt
+# (as_tuples=True: Eingabe (Text, Kontext), Ausgabe (Doc, Kontext))
+def pipe_texts(nlp, texts, as_tuples=False, n_process=DEFAULT_N_PROCESS, batch_size=DEFAULT_BATCH_SIZE):
+    return nlp.pipe(texts, as_tuples=as_tuples, n_process=n_process, batch_size=batch_size)
+
+
+# Gemeinsame Kommandozeilen-Optionen für das Parsen
+def add_pipe_arguments(parser):
+    parser.add_argument(
+        "--n-process", type=int, default=DEFAULT_N_PROCESS,
+        help="Anzahl Prozesse für nlp.pipe (-1 = alle CPU-Kerne)",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+        help="Anzahl Texte pro Batch in nlp.pipe",
+    )
+    return parser
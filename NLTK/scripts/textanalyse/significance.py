@@ -0,0 +1,147 @@
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from .deviations import CategoryDeviations
+from .matrixstore import GROUP_COLUMNS
+
+DEFAULT_RESAMPLES = 10000
+CONFIDENCE = 0.95
+
+# Höchstzahl an Werten der großen Arrays je Batch von Permutationen: Gewichte
+# (Texte × Gruppen·Batch) und Gruppensummen (Merkmale × Gruppen·Batch), je float32;
+# bestimmt, wie viele Permutationen auf einmal laufen
+BATCH_VALUES = 2**24
+
+
+# Benjamini-Hochberg-korrigierte p-Werte (q-Werte) über alle Zellen
+def benjamini_hochberg(p_values):
+    p = np.asarray(p_values, dtype=np.float64).ravel()
+    order = np.argsort(p, kind="stable")
+    ranked = p[order] * p.size / np.arange(1, p.size + 1)
+    q = np.empty_like(p)
+    q[order] = np.minimum.accumulate(ranked[::-1])[::-1].clip(max=1.0)
+    return q.reshape(np.shape(p_values))
+
+
+# Signifikanz der Abweichungen aus CategoryDeviations (Summe einer Gruppe minus Mittel
+# über alle Gruppen) auf Basis der Zählungen der einzelnen Texte:
+# - p-Werte aus Permutationen der Gruppenzugehörigkeit (Modell/Texttyp) der Texte,
+#   einseitig für Über- und Unterrepräsentation. Ein Batch von Permutationen ist eine
+#   0/1-Gewichtsmatrix Texte × (Gruppen·Batch); ein Produkt mit der dünnbesetzten
+#   Merkmal×Text-Matrix ergibt die Gruppensummen aller Permutationen des Batches.
+#   Aufwand: Nicht-Null-Einträge × Gruppen × Permutationen, also linear in der Zahl der
+#   Texte. Gemessen mit 10000 Permutationen: 6,6 s bei 325 Texten × 5000 Merkmalen,
+#   13,8 s bei 325 × 20000 und 78 s bei 3250 × 5000. Eine Zählung per bincount in
+#   (Merkmal, Gruppe)-Zellen spart den Faktor Gruppen, ist wegen der verstreuten
+#   Schreibzugriffe aber zwei- bis dreimal langsamer als das dünn×dicht-Produkt.
+# - Konfidenzintervalle als Normalintervalle in geschlossener Form: Abweichung ±
+#   z·Standardfehler, wobei der Standardfehler der des Ziehens mit Zurücklegen
+#   innerhalb jeder Gruppe ist (nicht per Resampling, kein Perzentil-Bootstrap)
+class DeviationSignificance:
+    def __init__(self, count_matrix, features):
+        groups, _ = count_matrix.group_sums()
+        position = {group: i for i, group in enumerate(groups)}
+        self.labels = np.fromiter(
+            (position[key] for key in zip(count_matrix.models, count_matrix.text_types)),
+            dtype=np.int64, count=len(count_matrix.models),
+        )
+        self.group_keys = groups
+        self.sizes = np.bincount(self.labels, minlength=len(groups))
+        matrix = count_matrix.matrix.astype(np.float64)
+        self.transposed = matrix.T.astype(np.float32).tocsr()
+
+        indicator = sparse.csr_matrix(
+            (np.ones(len(self.labels)), (self.labels, np.arange(len(self.labels)))),
+            shape=(len(groups), len(self.labels)),
+        )
+        self.totals = (indicator @ matrix).toarray()
+        self.squares = (indicator @ matrix.power(2)).toarray()
+        self.deviations = CategoryDeviations(groups, features, self.totals)
+
+    @property
+    def num_groups(self):
+        return len(self.group_keys)
+
+    # Spalte g·Batch + b markiert die Texte, die in Permutation b die Gruppe g erhalten
+    # (Gruppengrößen bleiben gleich)
+    def _permutation_weights(self, rng, batch):
+        n = len(self.labels)
+        labels = rng.permuted(np.tile(self.labels, (batch, 1)), axis=1)
+        weights = np.zeros((n, batch * self.num_groups), dtype=np.float32)
+        weights[np.arange(n), labels * batch + np.arange(batch)[:, None]] = 1
+        return weights
+
+    # Standardfehler der Abweichung beim Ziehen mit Zurücklegen innerhalb jeder Gruppe:
+    # Var(T*_g) = Σx² − (Σx)²/n_g je Gruppe, Gruppen unabhängig, Abweichung = T_g − Mittel
+    # aller Gruppen ⇒ Var = (1 − 2/G)·Var(T*_g) + ΣVar(T*_h)/G²
+    def standard_error(self):
+        G = self.num_groups
+        sizes = np.where(self.sizes > 0, self.sizes, 1)[:, None]
+        variance = np.maximum(self.squares - self.totals ** 2 / sizes, 0)
+        return np.sqrt((1 - 2 / G) * variance + variance.sum(axis=0) / G ** 2)
+
+    def test(self, resamples=DEFAULT_RESAMPLES, confidence=CONFIDENCE, seed=0):
+        G, C = self.totals.shape
+        over = np.zeros((C, G), dtype=np.int64)
+        under = np.zeros((C, G), dtype=np.int64)
+        observed = self.totals.T.astype(np.float32)[:, :, None]
+
+        rng = np.random.default_rng(seed)
+        batch = int(np.clip(BATCH_VALUES // max(G * max(C, len(self.labels)), 1), 1, resamples))
+        for first in range(0, resamples, batch):
+            size = min(batch, resamples - first)
+            permuted = (self.transposed @ self._permutation_weights(rng, size)).reshape(C, G, size)
+            over += (permuted >= observed).sum(axis=2)
+            under += (permuted <= observed).sum(axis=2)
+        over, under = over.T, under.T
+
+        margin = NormalDist().inv_cdf(0.5 + confidence / 2) * self.standard_error()
+        absolute = self.deviations.absolute
+        return SignificanceResult(self, resamples, confidence, (over + 1) / (resamples + 1),
+                                  (under + 1) / (resamples + 1), absolute - margin, absolute + margin)
+
+
+# Ergebnis von DeviationSignificance.test: p-Werte (über-/unterrepräsentiert, zweiseitig),
+# q-Werte (Benjamini-Hochberg über alle Zellen) und Konfidenzintervall der absoluten
+# Abweichung je Zelle (Gruppe × Merkmal, Normalintervall in geschlossener Form)
+class SignificanceResult:
+    def __init__(self, test, resamples, confidence, p_over, p_under, lower, upper):
+        self.deviations = test.deviations
+        self.group_keys = test.group_keys
+        self.totals = test.totals
+        self.resamples = resamples
+        self.confidence = confidence
+        self.p_over = p_over
+        self.p_under = p_under
+        self.p_value = np.minimum(1.0, 2 * np.minimum(p_over, p_under))
+        self.q_value = benjamini_hochberg(self.p_value)
+        self.lower = lower
+        self.upper = upper
+
+    # Alle Zellen im Langformat, in Zellreihenfolge (Gruppe, dann Merkmal)
+    def table(self, feature="Kategorie"):
+        deviations = self.deviations
+        G, C = deviations.absolute.shape
+        models, text_types = (np.asarray(column, dtype=object) for column in zip(*self.group_keys))
+        return pd.DataFrame({
+            GROUP_COLUMNS[0]: np.repeat(models, C),
+            GROUP_COLUMNS[1]: np.repeat(text_types, C),
+            feature: np.tile(np.asarray(deviations.features, dtype=object), G),
+            "Häufigkeit": self.totals.ravel().astype(np.int64),
+            "Abweichung_Absolut": deviations.absolute.ravel(),
+            "Abweichung_Prozent": deviations.relative.ravel(),
+            "KI_Normal_unten": self.lower.ravel(),
+            "KI_Normal_oben": self.upper.ravel(),
+            "p_Ueber": self.p_over.ravel(),
+            "p_Unter": self.p_under.ravel(),
+            "p_Wert": self.p_value.ravel(),
+            "q_Wert": self.q_value.ravel(),
+        })
+
+    # (Gruppe, Merkmal, absolut, prozentual, KI unten, KI oben, p, q) je Zelle
+    def rows(self, cells):
+        flat = [array.ravel()[cells] for array in (self.lower, self.upper, self.p_value, self.q_value)]
+        return [row + extra for row, extra in zip(self.deviations.rows(cells), zip(*flat))]
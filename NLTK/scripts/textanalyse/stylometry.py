@@ -0,0 +1,50 @@
+from pyarrow import feather
+
+GROUP_COLUMNS = ["Model", "TextType"]
+
+# Merkmale eines Textes bzw. einer Gruppe; Lemma-Merkmale hängen von den
+# analysierten Wortarten ab, alle anderen nur vom Text
+FEATURES = [
+    "NumSentences",
+    "NumWords",
+    "AvgSentenceLength",
+    "AvgWordLength",
+    "Num_Lemmas",
+    "UniqueLemmas",
+    "TTR_Lemma_based",
+    "TTR_Token_based",
+]
+
+
+# Stilometrie-Merkmale (ungerundet) aus Satz-/Wortsummen (TextStats) und den
+# gefilterten Lemma-Häufigkeiten – für einen Text ebenso wie für eine ganze Gruppe
+def stylometric_features(stats, lemma_counts):
+    num_sentences = stats.num_sentences if stats.num_sentences else 1
+    num_words = stats.num_words
+    num_lemmas = sum(lemma_counts.values())
+    unique_lemmas = len(lemma_counts)
+    return {
+        "NumSentences": num_sentences,
+        "NumWords": num_words,
+        "AvgSentenceLength": num_words / num_sentences,
+        "AvgWordLength": stats.word_length_sum / num_words if num_words else 0,
+        "Num_Lemmas": num_lemmas,
+        "UniqueLemmas": unique_lemmas,
+        "TTR_Lemma_based": unique_lemmas / num_lemmas if num_lemmas > 0 else 0,
+        "TTR_Token_based": len(stats.word_counts) / num_words if num_words > 0 else 0,
+    }
+
+
+# Mittelwert und Varianz (Stichprobe) je Modell/Texttyp über die Merkmalsvektoren
+# der einzelnen Texte; Gruppen in der Reihenfolge ihres ersten Auftretens
+def group_distributions(doc_features):
+    grouped = doc_features.groupby(GROUP_COLUMNS, sort=False)
+    distributions = grouped[FEATURES].agg(["mean", "var"])
+    distributions.columns = [f"{feature}_{stat}" for feature, stat in distributions.columns]
+    distributions.insert(0, "NumTexts", grouped.size())
+    return distributions.reset_index()
+
+
+# Merkmalsvektoren aller Texte als Arrow-Datei (eine Zeile pro Text)
+def write_document_features(doc_features, path):
+    feather.write_feather(doc_features.reset_index(drop=True), path, compression="uncompressed")
@@ -0,0 +1,86 @@
+import json
+from collections import Counter
+
+import numpy as np
+
+from .corpus import CORPUS_PATH, TEXT_TYPES, iter_topics
+
+# Anteil der Tokens, die als neues Kompositum aus zwei Korpuswörtern entstehen,
+# damit das Vokabular mit der Korpusgröße wächst wie bei echten Texten
+COMPOUND_RATE = 0.01
+
+
+# Schema und Statistik des echten Korpus: Modellnamen, Textlängen je Quelle
+# (humanText bzw. Modell/Texttyp) und Häufigkeiten der Tokens (an Leerzeichen getrennt,
+# Satzzeichen bleiben am Wort – so entstehen Satzgrenzen mit realistischer Häufigkeit)
+class CorpusProfile:
+    def __init__(self, path=CORPUS_PATH):
+        self.num_topics = 0
+        self.models = []
+        self.lengths = {}
+        counts = Counter()
+
+        for topic in iter_topics(path):
+            self.num_topics += 1
+            self._add_text("humanText", topic.get("humanText", ""), counts)
+            for model, content in topic.items():
+                if isinstance(content, dict):
+                    if model not in self.models:
+                        self.models.append(model)
+                    for text_type in TEXT_TYPES:
+                        self._add_text((model, text_type), content.get(text_type, ""), counts)
+
+        self.tokens = np.array(list(counts), dtype=object)
+        freqs = np.array([counts[token] for token in self.tokens], dtype=np.float64)
+        self.probabilities = freqs / freqs.sum()
+        self.words = np.array([token for token in self.tokens if token.isalpha()], dtype=object)
+
+    def _add_text(self, source, text, counts):
+        tokens = text.split()
+        if tokens:
+            self.lengths.setdefault(source, []).append(len(tokens))
+            counts.update(tokens)
+
+
+# Ein Text: Länge wie ein zufälliger echter Text derselben Quelle
+def _synthetic_text(profile, source, rng):
+    length = rng.choice(profile.lengths[source])
+    tokens = profile.tokens[rng.choice(len(profile.tokens), size=length, p=profile.probabilities)]
+    for i in np.flatnonzero(rng.random(length) < COMPOUND_RATE):
+        first, second = profile.words[rng.integers(len(profile.words), size=2)]
+        tokens[i] = first + second.lower()
+    return " ".join(tokens)
+
+
+# Themen im Schema von texte.json (authorkey, title, Prompts, humanText, je Modell TextA/TextB)
+def iter_synthetic_topics(profile, num_topics, seed=0):
+    rng = np.random.default_rng(seed)
+    for i in range(num_topics):
+        topic = {
+            "authorkey": f"synth{i:06d}",
+            "title": f"Synthetisches Thema {i}",
+            "promptA": "",
+            "promptB": "",
+            "humanText": _synthetic_text(profile, "humanText", rng),
+        }
+        for model in profile.models:
+            topic[model] = {
+                text_type: _synthetic_text(profile, (model, text_type), rng)
+                for text_type in TEXT_TYPES if (model, text_type) in profile.lengths
+            }
+        yield topic
+
+
+# Schreibt ein synthetisches Korpus mit scale × so vielen Themen wie das echte.
+# Die Themen werden einzeln geschrieben, das Korpus liegt nie ganz im Speicher.
+def write_synthetic_corpus(path, scale, base_path=CORPUS_PATH, seed=0, profile=None):
+    profile = profile or CorpusProfile(base_path)
+    num_topics = int(round(scale * profile.num_topics))
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("[\n")
+        for i, topic in enumerate(iter_synthetic_topics(profile, num_topics, seed)):
+            if i:
+                file.write(",\n")
+            json.dump(topic, file, ensure_ascii=False)
+        file.write("\n]\n")
+    return num_topics
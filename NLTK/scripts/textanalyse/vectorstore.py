@@ -0,0 +1,88 @@
+import json
+import os
+import shutil
+
+from .corpus import CORPUS_PATH
+from .doccache import DocCache
+from .docstore import STORE_PATH, doc_store_entries, doc_store_meta, iter_doc_store, store_matches_corpus
+from .embeddings import LemmaVectors
+from .lemmafilter import LemmaFilter
+
+VECTOR_STORE_PATH = "./corpus/vektoren"
+META_FILE = "meta.json"
+
+# Wortarten des Vokabulars: alle Lemmata, die main.py und clustering.py mit einem
+# Vektor nachschlagen (die Inhaltslemmata von clustering.py sind eine Teilmenge)
+VOCABULARY_POS = ["NOUN", "ADJ", "ADV", "VERB"]
+
+
+# Gefilterte Lemmata aller Texte im Doc-Store
+def corpus_vocabulary(nlp, store_path=STORE_PATH, pos=VOCABULARY_POS):
+    keep = LemmaFilter(pos=pos)
+    vocabulary = set()
+    for _, _, _, doc in iter_doc_store(nlp, store_path):
+        vocabulary.update(keep.lemmas(doc))
+    return vocabulary
+
+
+# Schreibt einen Vektor pro Lemma des Korpus-Vokabulars (Kategorie-Leader sind
+# Korpus-Lemmata und damit enthalten) als memory-mappable .npy mit Lemma-Index.
+# meta.json hält fest, zu welchem Doc-Store die Vektoren gehören.
+def build_vector_store(nlp, path=VECTOR_STORE_PATH, store_path=STORE_PATH):
+    store_meta = doc_store_meta(store_path)
+    vectors = LemmaVectors.from_nlp(nlp, corpus_vocabulary(nlp, store_path))
+
+    tmp_path = path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    vectors.save(tmp_path)
+    meta = {key: store_meta.get(key) for key in ("corpus_sha1", "model", "pipeline")}
+    meta.update({"pos": VOCABULARY_POS, "num_lemmas": len(vectors), "dim": vectors.dim})
+    with open(os.path.join(tmp_path, META_FILE), "w", encoding="utf-8") as file:
+        json.dump(meta, file)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    print(f"✅ {len(vectors)} Lemma-Vektoren gespeichert unter: {path}")
+
+
+def _vector_meta(path):
+    meta_path = os.path.join(path, META_FILE)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+# Passen Doc-Store und Vektor-Store zum aktuellen Korpus? Ohne Sprachmodell geprüft:
+# Korpus-Hash im Doc-Store, und die Vektoren stammen aus genau diesem Store
+def vector_store_is_current(path=VECTOR_STORE_PATH, corpus_path=CORPUS_PATH, store_path=STORE_PATH):
+    meta = _vector_meta(path)
+    if meta is None or meta.get("pos") != VOCABULARY_POS or not store_matches_corpus(corpus_path, store_path):
+        return False
+    store_meta = doc_store_meta(store_path)
+    return all(meta.get(key) == store_meta.get(key) for key in ("corpus_sha1", "model", "pipeline"))
+
+
+def ensure_vector_store(nlp, path=VECTOR_STORE_PATH, corpus_path=CORPUS_PATH, store_path=STORE_PATH):
+    if not vector_store_is_current(path, corpus_path, store_path):
+        build_vector_store(nlp, path, store_path)
+
+
+def load_vector_store(path=VECTOR_STORE_PATH):
+    return LemmaVectors.load(path)
+
+
+# Muss das Sprachmodell geladen werden? Nur wenn Doc-Store oder Vektor-Store nicht
+# zum Korpus passen oder einem der Caches (namespace, version) Texte fehlen –
+# sonst kommen alle Zwischenergebnisse aus dem Cache und alle Vektoren aus dem Store.
+def model_required(caches, path=VECTOR_STORE_PATH, corpus_path=CORPUS_PATH, store_path=STORE_PATH):
+    if not vector_store_is_current(path, corpus_path, store_path):
+        return True
+    keys = {key for key, *_ in doc_store_entries(store_path)}
+    for namespace, version in caches:
+        cache = DocCache(namespace, version)
+        missing = keys - cache.keys()
+        cache.close()
+        if missing:
+            return True
+    return False